@@ -1,21 +1,41 @@
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+import hashlib
+import hmac
 import json
+import logging
 import os
+import sqlite3
+import threading
+from collections import namedtuple
+from contextlib import closing
+from functools import partial
+
+from basket_series import BasketSeries
+from date_index import nearest_positions, parse_date, shift_months
+from response_cache import PRECOMPUTED_YEARS, ResponseCache
+from downsample import RESOLUTIONS, lttb_indices
+from drawdowns import DEFAULT_EPISODES, MAX_EPISODES, drawdown_summary
+from risk_metrics import headline
+from rolling_risk import DEFAULT_WINDOW as DEFAULT_RISK_WINDOW, WINDOWS as RISK_WINDOWS, rolling_risk, rounded
+from rolling_returns import format_day_labels, format_month_labels, rolling_cagr, rolling_distributions, trailing_cagr, trailing_returns
+import nav_quality
+import nav_store
+from nav_arrays import load_shared
+from ingest import ingest_workbooks, read_nifty_csv
+from reloader import Reloader
+from workbook_cache import data_version, workbook_fingerprint
+
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
 
-# Load Nifty 50 historical data
+# Nifty 50 historical data
 NIFTY_DATA_FILE = os.path.join(os.path.dirname(__file__), 'nifty_data.csv')
-nifty_df = pd.read_csv(NIFTY_DATA_FILE)
-nifty_df['DATE'] = pd.to_datetime(nifty_df['DATE'], format='%d/%m/%y')
-nifty_df = nifty_df.sort_values('DATE')
 
-# Load new basket Excel data
+# Basket Excel data (parsed once into the binary cache, see workbook_cache.py)
 WHITE_BASKET_FILE = os.path.join(os.path.dirname(__file__), 'White Basket.xlsx')
 EVERY_COMMON_INDIA_FILE = os.path.join(os.path.dirname(__file__), 'every_common_india.xlsx')
 RAISING_INDIA_FILE = os.path.join(os.path.dirname(__file__), 'Raising_India.xlsx')
@@ -25,52 +45,119 @@ CONSERVATIVE_BASKET_FILE = os.path.join(os.path.dirname(__file__), 'CONSERVATIVE
 DUSSHERA_BASKET_FILE = os.path.join(os.path.dirname(__file__), 'Dusshera basket.xlsx')
 YELLOW_BASKET_FILE = os.path.join(os.path.dirname(__file__), 'Yellow basket.xlsx')
 
-# Load White Basket
-white_basket_df = pd.read_excel(WHITE_BASKET_FILE)
-white_basket_df.columns = ['DATE', 'Basket_NAV', 'NIFTY_50']
-white_basket_df['DATE'] = pd.to_datetime(white_basket_df['DATE'])
-white_basket_df = white_basket_df.sort_values('DATE')
-
-# Load Every Common India
-every_common_df = pd.read_excel(EVERY_COMMON_INDIA_FILE)
-every_common_df['DATE'] = pd.to_datetime(every_common_df['DATE'])
-every_common_df = every_common_df.sort_values('DATE')
-
-# Load Raising India Basket
-raising_india_df = pd.read_excel(RAISING_INDIA_FILE)
-raising_india_df.columns = ['DATE', 'Basket_NAV', 'NIFTY_50']
-raising_india_df['DATE'] = pd.to_datetime(raising_india_df['DATE'])
-raising_india_df = raising_india_df.sort_values('DATE')
-
-# Load Great India Basket
-great_india_df = pd.read_excel(GREAT_INDIA_FILE)
-great_india_df.columns = ['DATE', 'Basket_NAV', 'NIFTY_50']
-great_india_df['DATE'] = pd.to_datetime(great_india_df['DATE'], errors='coerce')
-great_india_df = great_india_df.sort_values('DATE')
-
-# Load Aggressive Basket (dates in descending order, need to sort)
-aggressive_basket_df = pd.read_excel(AGGRESSIVE_BASKET_FILE)
-aggressive_basket_df.columns = ['DATE', 'Basket_NAV', 'NIFTY_50']
-aggressive_basket_df['DATE'] = pd.to_datetime(aggressive_basket_df['DATE'], errors='coerce')
-aggressive_basket_df = aggressive_basket_df.sort_values('DATE')  # Sort ascending (old to new)
-
-# Load Conservative Basket
-conservative_basket_df = pd.read_excel(CONSERVATIVE_BASKET_FILE)
-conservative_basket_df.columns = ['DATE', 'Basket_NAV', 'NIFTY_50']
-conservative_basket_df['DATE'] = pd.to_datetime(conservative_basket_df['DATE'])
-conservative_basket_df = conservative_basket_df.sort_values('DATE')
-
-# Load Dusshera Basket
-dusshera_basket_df = pd.read_excel(DUSSHERA_BASKET_FILE)
-dusshera_basket_df.columns = ['DATE', 'Basket_NAV', 'NIFTY_50']
-dusshera_basket_df['DATE'] = pd.to_datetime(dusshera_basket_df['DATE'])
-dusshera_basket_df = dusshera_basket_df.sort_values('DATE')
-
-# Load Yellow Basket
-yellow_basket_df = pd.read_excel(YELLOW_BASKET_FILE)
-yellow_basket_df.columns = ['DATE', 'Basket_NAV', 'NIFTY_50']
-yellow_basket_df['DATE'] = pd.to_datetime(yellow_basket_df['DATE'])
-yellow_basket_df = yellow_basket_df.sort_values('DATE')
+# Identifies the loaded data; cached responses are tied to it
+DATA_VERSION = data_version([
+    NIFTY_DATA_FILE, WHITE_BASKET_FILE, EVERY_COMMON_INDIA_FILE, RAISING_INDIA_FILE, GREAT_INDIA_FILE,
+    AGGRESSIVE_BASKET_FILE, CONSERVATIVE_BASKET_FILE, DUSSHERA_BASKET_FILE, YELLOW_BASKET_FILE
+])
+
+# NAVs are stored as float64; ALPHANIFTY_NAV_DTYPE=float32 halves them at ~7 significant digits
+NAV_DTYPE = np.dtype(os.environ.get('ALPHANIFTY_NAV_DTYPE', 'float64'))
+
+# Column layout of each basket workbook: (path, column names to assign or
+# None to keep the workbook's own, basket NAV column, NIFTY column)
+BASKET_COLUMNS = ['DATE', 'Basket_NAV', 'NIFTY_50']
+BASKET_WORKBOOKS = {
+    'white_basket': (WHITE_BASKET_FILE, BASKET_COLUMNS, 'Basket_NAV', 'NIFTY_50'),
+    'every_common': (EVERY_COMMON_INDIA_FILE, None, 'Basket NAV Every Common India', 'NIFTY 50'),
+    'raising_india': (RAISING_INDIA_FILE, BASKET_COLUMNS, 'Basket_NAV', 'NIFTY_50'),
+    'great_india': (GREAT_INDIA_FILE, BASKET_COLUMNS, 'Basket_NAV', 'NIFTY_50'),
+    # Aggressive basket rows are in descending date order; ingestion sorts every workbook
+    'aggressive_basket': (AGGRESSIVE_BASKET_FILE, BASKET_COLUMNS, 'Basket_NAV', 'NIFTY_50'),
+    'conservative_basket': (CONSERVATIVE_BASKET_FILE, BASKET_COLUMNS, 'Basket_NAV', 'NIFTY_50'),
+    'dusshera_basket': (DUSSHERA_BASKET_FILE, BASKET_COLUMNS, 'Basket_NAV', 'NIFTY_50'),
+    'yellow_basket': (YELLOW_BASKET_FILE, BASKET_COLUMNS, 'Basket_NAV', 'NIFTY_50'),
+}
+
+# Source file behind each series; a reload re-ingests only those whose content changed.
+# nav_store.APP_SERIES maps the same names to the same files; imports into the NAV store may not use them.
+SOURCE_FILES = {'nifty': NIFTY_DATA_FILE, **{name: spec[0] for name, spec in BASKET_WORKBOOKS.items()}}
+
+def validated(arrays, version):
+    """Repair freshly ingested arrays (see nav_quality.py) and record what was repaired in the data-quality report"""
+    cleaned, reports = nav_quality.repair_all(arrays)
+    nav_quality.write_report(reports, version)
+    return cleaned
+
+def load_nav_arrays():
+    """Read and normalise the NIFTY CSV and every basket workbook into BasketSeries arrays"""
+    # Workbooks that need parsing are read in parallel processes (see ingest.py)
+    return validated({
+        'nifty': read_nifty_csv(NIFTY_DATA_FILE, NAV_DTYPE),
+        **ingest_workbooks(BASKET_WORKBOOKS, NAV_DTYPE),
+    }, DATA_VERSION)
+
+# Map the normalised arrays shared by all workers (see nav_arrays.py); the
+# workbooks are only read when this data version hasn't been published yet.
+# Each basket is a BasketSeries: contiguous date/NAV arrays plus its lookback
+# index (date windows are binary searches, returns look back 1M..10Y in O(1))
+# and month-start positions. served_series ({name: BasketSeries}, one per
+# source file) is only ever replaced by a new dict in one assignment, so a
+# reader sees the old or the new set of series.
+nav_data = load_shared(f'{DATA_VERSION}-{NAV_DTYPE.name}', load_nav_arrays)
+served_series = {
+    name: BasketSeries(name, nav_data[name]['dates'], nav_data[name].get('basket'), nav_data[name]['nifty'])
+    for name in SOURCE_FILES
+}
+source_fingerprints = {name: workbook_fingerprint(path) for name, path in SOURCE_FILES.items()}
+
+# Daily rows appended after a source file's last date live in the NAV store
+# under the series name (see nav_store.py) and are applied on top of the
+# files at startup and on every reload. appended_digests holds a digest of
+# the rows each extended series serves on top of its file, so the cache
+# version tells apart workers serving different rows. series_lock
+# serialises appends and reloads within a worker.
+appended_digests = {}
+series_lock = threading.Lock()
+
+def open_nav_store():
+    """Read-only connection to the SQLite NAV store, or None before anything was imported"""
+    try:
+        return nav_store.connect(readonly=True)
+    except sqlite3.Error:
+        return None
+
+def append_stored_rows(series_by_name):
+    """{name: extended series} for the series with rows in the NAV store after their last date"""
+    conn = open_nav_store()
+    if conn is None:
+        return {}
+    extended = {}
+    with closing(conn):
+        for name, series in series_by_name.items():
+            after = series.index.last + np.timedelta64(1, 'D') if series.index.valid else None
+            # Only rows appended to the series; an import under its name is never spliced on
+            rows = nav_store.read_series(conn, name, start=after, source=nav_store.APPEND_SOURCE)
+            if rows is None or not len(rows['dates']):
+                continue
+            try:
+                extended[name] = series.append(rows['dates'], None if series.basket is None else rows['basket'],
+                                               rows['nifty'])
+            except ValueError as e:
+                logger.warning('Not applying the rows appended to %s: %s', name, e)
+    return extended
+
+def appended_digest(series, file_dates):
+    """Digest of the rows `series` holds after the `file_dates` rows of its source file"""
+    rows = slice(int(np.count_nonzero(~np.isnat(file_dates))), series.index.valid)
+    digest = hashlib.sha256()
+    for values in (series.dates, series.basket, series.nifty):
+        if values is not None:
+            digest.update(np.ascontiguousarray(values[rows]).tobytes())
+    return digest.hexdigest()[:16]
+
+def cache_version(version, appended):
+    """Version of the served data: the source files' version plus the rows appended since"""
+    if not appended:
+        return version
+    digest = hashlib.sha256(repr(sorted(appended.items())).encode()).hexdigest()[:8]
+    return f'{version}+{digest}'
+
+# Rows appended while this process was not running
+_extended = append_stored_rows(served_series)
+served_series = {**served_series, **_extended}
+appended_digests.update({name: appended_digest(series, nav_data[name]['dates']) for name, series in _extended.items()})
+
 
 # Fund data from Excel
 CONSERVATIVE_BALANCED_FUNDS = [
@@ -196,96 +283,87 @@ def calculate_weighted_metrics(funds):
         'expenseRatio': round(weighted_expense, 2)
     }
 
-def generate_nav_based_graph_data(funds, years=5):
+def headline_risk(risk):
+    """Volatility and Sharpe for a payload's metrics: 3Y, or the whole history when shorter (0 without data)"""
+    metrics = headline(risk) or {}
+    return metrics.get('volatility', 0), metrics.get('sharpe') or 0
+
+# Seed for the simulated fund volatility, so the same query always returns the same series
+NAV_SIMULATION_SEED = 20240101
+
+def simulate_portfolio_navs(funds, periods, base_nav=100, seed=NAV_SIMULATION_SEED):
+    """Weighted portfolio NAV for months 0..periods-1 as one months x funds computation"""
+    month = np.arange(periods)
+    time_years = (month / 12)[:, None]
+    
+    incp_ret = np.array([fund['incpRet'] for fund in funds], dtype=np.float64)
+    ret_3y = np.array([fund['ret3Y'] for fund in funds], dtype=np.float64)
+    ret_5y = np.array([fund['ret5Y'] for fund in funds], dtype=np.float64)
+    std = np.array([fund['std'] for fund in funds], dtype=np.float64)
+    weights = np.array([fund['allocation'] for fund in funds], dtype=np.float64) / 100
+    
+    # Use appropriate return based on time period (3Y return as the fallback)
+    annual_return = np.where(
+        time_years <= 1, incp_ret,
+        np.where(time_years <= 3, ret_3y,
+                 np.where((time_years <= 5) & (ret_5y > 0), ret_5y, ret_3y))
+    )
+    
+    # Add volatility (standard deviation) for realistic fluctuations
+    rng = np.random.default_rng(seed)
+    volatility = rng.normal(0.0, 1.0, size=(periods, len(funds))) * (std / 100 / 12)
+    monthly_return = (1 + annual_return / 100) ** (1 / 12) - 1
+    
+    # Compound each fund, then weight by allocation
+    fund_navs = base_nav * (1 + monthly_return + volatility) ** month[:, None]
+    return np.round(fund_navs @ weights, 2)
+
+def generate_nav_based_graph_data(funds, years=5, start=None, end=None, nifty=None):
     """Generate NAV-based performance graph data"""
+    nifty = served_series['nifty'] if nifty is None else nifty
     # Starting NAV (assumed base of 100 for each fund)
     base_nav = 100
     
-    # Generate monthly data points
-    months = years * 12
-    dates = []
-    current_date = datetime.now()
-    
-    for i in range(months, -1, -1):
-        date = current_date - timedelta(days=i*30)
-        dates.append(date.strftime('%Y-%m'))
+    # Monthly points ending at `end`, or at the latest NIFTY date so the
+    # series doesn't move with the wall clock
+    current_date = (end if end is not None else nifty.index.last).astype('datetime64[D]')
+    if start is not None:
+        months = max(0, int((current_date - start.astype('datetime64[D]')).astype(np.int64)) // 30)
+    else:
+        months = years * 12
+    label_dates = current_date - np.arange(months, -1, -1) * np.timedelta64(30, 'D')
+    dates = format_month_labels(label_dates, '%Y-%m')
     
     # Calculate portfolio NAV over time using weighted returns
-    portfolio_navs = []
-    
-    for i, date in enumerate(dates):
-        # Calculate time elapsed in years
-        time_years = i / 12
-        
-        # Calculate NAV for each fund and weight it
-        portfolio_nav = 0
-        
-        for fund in funds:
-            # Use appropriate return based on time period
-            if time_years <= 1:
-                annual_return = fund['incpRet']
-            elif time_years <= 3:
-                annual_return = fund['ret3Y']
-            elif time_years <= 5 and fund['ret5Y'] > 0:
-                annual_return = fund['ret5Y']
-            else:
-                annual_return = fund['ret3Y']  # Fallback to 3Y return
-            
-            # Calculate NAV using compound interest formula
-            # Add volatility (standard deviation) for realistic fluctuations
-            volatility_factor = np.random.normal(0, fund['std'] / 100 / 12)
-            monthly_return = (1 + annual_return / 100) ** (1/12) - 1
-            adjusted_return = monthly_return + volatility_factor
-            
-            fund_nav = base_nav * ((1 + adjusted_return) ** i)
-            
-            # Weight by allocation
-            portfolio_nav += fund_nav * (fund['allocation'] / 100)
-        
-        portfolio_navs.append(round(portfolio_nav, 2))
+    portfolio_navs = simulate_portfolio_navs(funds, len(dates), base_nav).tolist()
     
     # Get actual Nifty 50 historical data
-    nifty_navs = []
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=years*365)
+    end_date = current_date
+    start_date = end_date - np.timedelta64(months * 30 if start is not None else years * 365, 'D')
     
-    # Filter Nifty data for the time period
-    nifty_period = nifty_df[(nifty_df['DATE'] >= start_date) & (nifty_df['DATE'] <= end_date)].copy()
+    # Filter Nifty data for the time period (binary search on the sorted date index)
+    lo, hi = nifty.index.window(start_date, end_date)
     
-    if len(nifty_period) > 0:
+    if hi > lo:
+        nifty_values = nifty.nifty[lo:hi]
+        window_dates = nifty.dates[lo:hi]
+        
         # Get the earliest Nifty 50 value as base
-        base_nifty_value = float(nifty_period.iloc[0]['NIFTY 50'])
+        base_nifty_value = float(nifty_values[0])
         
-        # Resample to monthly data - using set_value to avoid SettingWithCopyWarning
-        nifty_period.loc[:, 'year_month'] = nifty_period['DATE'].dt.to_period('M')  # type: ignore
-        nifty_monthly = nifty_period.groupby('year_month')['NIFTY 50'].last().reset_index()
-        nifty_monthly.loc[:, 'year_month'] = nifty_monthly['year_month'].astype(str).apply(lambda x: pd.to_datetime(x))
+        # Last value of each month, aligned once to the closest month of every label
+        starts = nifty.bucket_starts(lo, hi)
+        nifty_monthly = nifty_values[np.r_[starts[1:], hi - lo] - 1]
+        nifty_months = window_dates[starts].astype('datetime64[M]').astype('datetime64[D]')
+        closest = nearest_positions(nifty_months, label_dates.astype('datetime64[M]').astype('datetime64[D]'))
         
-        # Align with our date labels
-        for date_str in dates:
-            try:
-                target_date = datetime.strptime(date_str, '%Y-%m')
-                # Find closest month in nifty data
-                time_diffs = (nifty_monthly['year_month'] - target_date).abs()
-                closest_idx = int(time_diffs.idxmin())
-                nifty_value = float(nifty_monthly.loc[closest_idx, 'NIFTY 50'])  # type: ignore
-                
-                # Normalize to base 100 for comparison
-                normalized_nav = (nifty_value / base_nifty_value) * base_nav
-                nifty_navs.append(round(normalized_nav, 2))
-            except:
-                # Fallback to portfolio NAV if date not found
-                if len(nifty_navs) > 0:
-                    nifty_navs.append(nifty_navs[-1])
-                else:
-                    nifty_navs.append(base_nav)
+        # Normalize to base 100 for comparison
+        nifty_navs = np.round(nifty_monthly[closest].astype(np.float64) / base_nifty_value * base_nav, 2).tolist()
     else:
         # Fallback: use estimated CAGR if no data available
         nifty_cagr = 12.0
-        for i in range(len(dates)):
-            time_years = i / 12
-            nifty_nav = base_nav * ((1 + nifty_cagr / 100) ** time_years)
-            nifty_navs.append(round(nifty_nav, 2))
+        time_years = np.arange(len(dates)) / 12
+        nifty_navs = np.round(base_nav * (1 + nifty_cagr / 100) ** time_years, 2).tolist()
     
     return {
         'labels': dates,
@@ -294,7 +372,7 @@ def generate_nav_based_graph_data(funds, years=5):
     }
 
 def calculate_returns_from_nav(navs):
-    """Calculate returns from NAV data"""
+    """Calculate returns from a series with exactly one NAV per month (the simulated baskets)"""
     if len(navs) < 2:
         return {'1M': 0, '3M': 0, '6M': 0, '1Y': 0, '3Y': 0, '5Y': 0}
     
@@ -328,500 +406,191 @@ def calculate_returns_from_nav(navs):
     
     return returns
 
-def generate_great_india_graph_data(years=5):
-    """Generate graph data for Great India Basket from Excel with both absolute and rolling returns"""
-    df = great_india_df.copy()
-    
-    # Filter data based on years requested
-    cutoff_date = df['DATE'].max() - pd.DateOffset(years=years)
-    df_filtered = df[df['DATE'] >= cutoff_date].copy()
-    
-    # Resample to monthly data
-    df_filtered.set_index('DATE', inplace=True)
-    df_monthly = df_filtered.resample('MS').first()
-    df_monthly.reset_index(inplace=True)
-    
-    # Prepare absolute returns data
-    labels = df_monthly['DATE'].dt.strftime('%b %y').tolist()
+def resolve_date_window(date_index, years=5, start=None, end=None):
+    """Row bounds (lo, hi) of a basket window given years and/or explicit start/end dates.
+
+    Without `start`, the window covers `years` back from `end`, or from the
+    latest date when `end` is later or not given (the row the metrics are
+    taken at). Both lookups are binary searches on the sorted date index.
+    """
+    if start is None:
+        anchor = date_index.last if end is None or end > date_index.last else end
+        start = shift_months(anchor, years * 12)
+    return date_index.window(start, end)
+
+def downsample_graph(graph, max_points, x=None):
+    """Thin a {labels, basketData, niftyData} series (or any other data keys) to at most max_points with LTTB"""
+    if not max_points or len(graph['labels']) <= max_points:
+        return graph
+    x = np.arange(len(graph['labels'])) if x is None else x
+    keep = lttb_indices(x, [values for key, values in graph.items() if key != 'labels'], max_points).tolist()
+    return {key: [values[i] for i in keep] for key, values in graph.items()}
+
+def generate_basket_graph_data(series, years=5, start=None, end=None,
+                               resolution=None, max_points=None, label_format='%b %y', rolling_months=None,
+                               rolling_from_cutoff=True):
+    """Generate absolute and rolling returns graph data for an Excel-backed basket"""
+    # Slice the requested window by binary search on the sorted date index
+    lo, hi = resolve_date_window(series.index, years, start, end)
+    if lo >= hi:
+        empty = {'labels': [], 'basketData': [], 'niftyData': []}
+        return {'absoluteReturns': empty, 'rollingReturns': dict(empty)}
+    window_dates = series.dates[lo:hi]
+    
+    # First row of each day/week/month (monthly matches the old resample('MS').first())
+    resolution = resolution or 'monthly'
+    starts = series.bucket_starts(lo, hi, resolution)
+    if resolution == 'monthly':
+        labels = series.labels_at(lo + starts, label_format)
+    else:
+        labels = format_day_labels(window_dates[starts], '%d ' + label_format)
     
-    # Get basket NAV and Nifty 50 values
-    basket_navs_raw = df_monthly['Basket_NAV'].ffill()
-    nifty_navs_raw = df_monthly['NIFTY_50'].ffill()
+    # Basket NAV and Nifty 50 on each bucket's first row (dense and positive, see nav_quality.py)
+    basket_navs_raw = series.basket[lo + starts]
+    nifty_navs_raw = series.nifty[lo + starts]
     
     # Normalize to 100 at the start of the filtered period for better comparison
-    basket_base = basket_navs_raw.iloc[0]
-    nifty_base = nifty_navs_raw.iloc[0]
-    basket_navs = ((basket_navs_raw / basket_base) * 100).tolist()
-    nifty_navs = ((nifty_navs_raw / nifty_base) * 100).tolist()
-    
-    # Calculate rolling returns
-    rolling_window = years * 12  # Convert years to months
-    rolling_labels = []
-    rolling_basket = []
-    rolling_nifty = []
-    
-    # Use the full dataset for rolling returns calculation
-    df_full = great_india_df.copy()
-    df_full = df_full.sort_values('DATE')
-    
-    # Calculate rolling returns
-    for i in range(rolling_window, len(df_full)):
-        current_date = df_full.iloc[i]['DATE']
-        past_date = df_full.iloc[i - rolling_window]['DATE']
-        
-        basket_current = df_full.iloc[i]['Basket_NAV']
-        basket_past = df_full.iloc[i - rolling_window]['Basket_NAV']
-        nifty_current = df_full.iloc[i]['NIFTY_50']
-        nifty_past = df_full.iloc[i - rolling_window]['NIFTY_50']
-        
-        # Calculate CAGR for the rolling period
-        basket_cagr = ((basket_current / basket_past) ** (1 / years) - 1) * 100
-        nifty_cagr = ((nifty_current / nifty_past) ** (1 / years) - 1) * 100
-        
-        # Only include data points from the requested time period
-        if current_date >= cutoff_date:
-            rolling_labels.append(current_date.strftime('%b %Y'))
-            rolling_basket.append(round(basket_cagr, 2))
-            rolling_nifty.append(round(nifty_cagr, 2))
+    basket_navs = ((basket_navs_raw / basket_navs_raw[0]) * 100).tolist()
+    nifty_navs = ((nifty_navs_raw / nifty_navs_raw[0]) * 100).tolist()
+    
+    absolute_returns = downsample_graph({
+        'labels': labels,
+        'basketData': [round(v, 2) for v in basket_navs],
+        'niftyData': [round(v, 2) for v in nifty_navs]
+    }, max_points, x=window_dates[starts].astype('datetime64[D]').astype(np.float64))
+    
+    # Calculate rolling returns for the window in one vectorized pass; each row
+    # is compared with the row `years` calendar years earlier (earlier rows
+    # still serve as the starting points of each rolling period)
+    rolling_lookback = series.index.positions(rolling_months or years * 12)
+    rolling_start = lo if rolling_from_cutoff or start is not None else 0
+    rolling_labels, rolling_basket, rolling_nifty = rolling_cagr(
+        series.dates,
+        series.basket,
+        series.nifty,
+        rolling_lookback,
+        years,
+        start=rolling_start,
+        stop=hi,
+        label_rows=partial(series.labels_at, label_format='%b %Y')
+    )
     
     return {
-        'absoluteReturns': {
-            'labels': labels,
-            'basketData': [round(float(v), 2) if not np.isnan(v) else 0 for v in basket_navs],
-            'niftyData': [round(float(v), 2) if not np.isnan(v) else 0 for v in nifty_navs]
-        },
-        'rollingReturns': {
+        'absoluteReturns': absolute_returns,
+        'rollingReturns': downsample_graph({
             'labels': rolling_labels,
             'basketData': rolling_basket,
             'niftyData': rolling_nifty
-        }
+        }, max_points)
     }
 
-def generate_aggressive_hybrid_graph_data(years=5):
-    """Generate graph data for Aggressive Hybrid Basket from Excel with both absolute and rolling returns"""
-    df = aggressive_basket_df.copy()
-    
-    # Filter data based on years requested
-    cutoff_date = df['DATE'].max() - pd.DateOffset(years=years)
-    df_filtered = df[df['DATE'] >= cutoff_date].copy()
-    
-    # Resample to monthly data
-    df_filtered.set_index('DATE', inplace=True)
-    df_monthly = df_filtered.resample('MS').first()
-    df_monthly.reset_index(inplace=True)
-    
-    # Prepare absolute returns data
-    labels = df_monthly['DATE'].dt.strftime('%b %y').tolist()
-    
-    # Get basket NAV and Nifty 50 values
-    basket_navs_raw = df_monthly['Basket_NAV'].ffill()
-    nifty_navs_raw = df_monthly['NIFTY_50'].ffill()
-    
-    # Normalize to 100 at the start of the filtered period for better comparison
-    basket_base = basket_navs_raw.iloc[0]
-    nifty_base = nifty_navs_raw.iloc[0]
-    basket_navs = ((basket_navs_raw / basket_base) * 100).tolist()
-    nifty_navs = ((nifty_navs_raw / nifty_base) * 100).tolist()
-    
-    # Calculate rolling returns
-    rolling_window = years * 12  # Convert years to months
-    rolling_labels = []
-    rolling_basket = []
-    rolling_nifty = []
-    
-    # Use the full dataset for rolling returns calculation
-    df_full = aggressive_basket_df.copy()
-    df_full = df_full.sort_values('DATE')
-    
-    # Calculate rolling returns
-    for i in range(rolling_window, len(df_full)):
-        current_date = df_full.iloc[i]['DATE']
-        past_date = df_full.iloc[i - rolling_window]['DATE']
-        
-        basket_current = df_full.iloc[i]['Basket_NAV']
-        basket_past = df_full.iloc[i - rolling_window]['Basket_NAV']
-        nifty_current = df_full.iloc[i]['NIFTY_50']
-        nifty_past = df_full.iloc[i - rolling_window]['NIFTY_50']
-        
-        # Calculate CAGR for the rolling period
-        basket_cagr = ((basket_current / basket_past) ** (1 / years) - 1) * 100
-        nifty_cagr = ((nifty_current / nifty_past) ** (1 / years) - 1) * 100
-        
-        # Only include data points from the requested time period
-        if current_date >= cutoff_date:
-            rolling_labels.append(current_date.strftime('%b %Y'))
-            rolling_basket.append(round(basket_cagr, 2))
-            rolling_nifty.append(round(nifty_cagr, 2))
+def rolling_risk_chart(series, years=5, start=None, end=None, resolution=None, max_points=None, window=None):
+    """Rolling volatility, Sharpe ratio, beta and correlation to NIFTY over `window` (see rolling_risk.py).
+    
+    There is one point per chart bucket, measured over the window ending on
+    the bucket's last row, and each chart is thinned like the NAV charts.
+    """
+    window = window or DEFAULT_RISK_WINDOW
+    lo, hi = resolve_date_window(series.index, years, start, end)
+    starts = series.bucket_starts(lo, hi, resolution or 'monthly') if lo < hi else np.zeros(0, dtype=np.intp)
+    rows = lo + np.r_[starts[1:], hi - lo][:len(starts)] - 1
+    risk = rolling_risk(series.dates, series.return_sums(), rows, series.index.positions(RISK_WINDOWS[window])[rows])
+    
+    dates = series.dates[risk['rows']]
+    labels = np.datetime_as_string(dates, unit='D').tolist()
+    
+    def chart(**values):
+        # Thin the float arrays (LTTB skips NaN), then round for JSON
+        graph = downsample_graph({'labels': labels, **values}, max_points, x=dates.astype(np.float64))
+        return {key: values if key == 'labels' else rounded(values) for key, values in graph.items()}
     
     return {
-        'absoluteReturns': {
-            'labels': labels,
-            'basketData': [round(float(v), 2) if not np.isnan(v) else 0 for v in basket_navs],
-            'niftyData': [round(float(v), 2) if not np.isnan(v) else 0 for v in nifty_navs]
-        },
-        'rollingReturns': {
-            'labels': rolling_labels,
-            'basketData': rolling_basket,
-            'niftyData': rolling_nifty
-        }
+        'window': window,
+        'volatility': chart(basketData=risk['basketVolatility'], niftyData=risk['niftyVolatility']),
+        'sharpe': chart(basketData=risk['basketSharpe'], niftyData=risk['niftySharpe']),
+        'beta': chart(basketData=risk['beta']),
+        'correlation': chart(basketData=risk['correlation']),
     }
 
-def generate_every_common_india_graph_data(years=5):
+def generate_great_india_graph_data(years=5, start=None, end=None, resolution=None, max_points=None, series=None):
+    """Generate graph data for Great India Basket from Excel with both absolute and rolling returns"""
+    series = served_series['great_india'] if series is None else series
+    return generate_basket_graph_data(
+        series, years, start, end,
+        resolution, max_points
+    )
+
+def generate_aggressive_hybrid_graph_data(years=5, start=None, end=None, resolution=None, max_points=None, series=None):
+    """Generate graph data for Aggressive Hybrid Basket from Excel with both absolute and rolling returns"""
+    series = served_series['aggressive_basket'] if series is None else series
+    return generate_basket_graph_data(
+        series, years, start, end,
+        resolution, max_points
+    )
+
+def generate_every_common_india_graph_data(years=5, start=None, end=None, resolution=None, max_points=None, series=None):
     """Generate graph data for Every Common India Basket with both absolute and rolling returns"""
-    df = every_common_df.copy()
-    
-    # Filter data based on years requested
-    cutoff_date = df['DATE'].max() - pd.DateOffset(years=years)
-    df_filtered = df[df['DATE'] >= cutoff_date].copy()
-    
-    # Resample to monthly data
-    df_filtered.set_index('DATE', inplace=True)
-    df_monthly = df_filtered.resample('MS').first()
-    df_monthly.reset_index(inplace=True)
-    
-    # Prepare absolute returns data
-    labels = df_monthly['DATE'].dt.strftime('%b %y').tolist()
-    
-    # Get basket NAV and Nifty 50 values
-    basket_navs_raw = df_monthly['Basket NAV Every Common India'].ffill()
-    nifty_navs_raw = df_monthly['NIFTY 50'].ffill()
-    
-    # Normalize to 100 at the start of the filtered period
-    basket_base = basket_navs_raw.iloc[0]
-    nifty_base = nifty_navs_raw.iloc[0]
-    basket_navs = ((basket_navs_raw / basket_base) * 100).tolist()
-    nifty_navs = ((nifty_navs_raw / nifty_base) * 100).tolist()
-    
-    # Calculate rolling returns
-    rolling_window = years * 12  # Convert years to months
-    rolling_labels = []
-    rolling_basket = []
-    rolling_nifty = []
-    
-    # Use the full dataset for rolling returns calculation
-    df_full = every_common_df.copy()
-    df_full = df_full.sort_values('DATE')
-    
-    # Calculate rolling returns
-    for i in range(rolling_window, len(df_full)):
-        current_date = df_full.iloc[i]['DATE']
-        
-        basket_current = df_full.iloc[i]['Basket NAV Every Common India']
-        basket_past = df_full.iloc[i - rolling_window]['Basket NAV Every Common India']
-        nifty_current = df_full.iloc[i]['NIFTY 50']
-        nifty_past = df_full.iloc[i - rolling_window]['NIFTY 50']
-        
-        # Calculate CAGR for the rolling period
-        if basket_past > 0 and nifty_past > 0:
-            basket_cagr = ((basket_current / basket_past) ** (1 / years) - 1) * 100
-            nifty_cagr = ((nifty_current / nifty_past) ** (1 / years) - 1) * 100
-            
-            # Only include data points from the requested time period
-            if current_date >= cutoff_date:
-                rolling_labels.append(current_date.strftime('%b %Y'))
-                rolling_basket.append(round(basket_cagr, 2))
-                rolling_nifty.append(round(nifty_cagr, 2))
-    
-    return {
-        'absoluteReturns': {
-            'labels': labels,
-            'basketData': [round(float(v), 2) if not np.isnan(v) else 0 for v in basket_navs],
-            'niftyData': [round(float(v), 2) if not np.isnan(v) else 0 for v in nifty_navs]
-        },
-        'rollingReturns': {
-            'labels': rolling_labels,
-            'basketData': rolling_basket,
-            'niftyData': rolling_nifty
-        }
-    }
+    series = served_series['every_common'] if series is None else series
+    return generate_basket_graph_data(
+        series, years, start, end,
+        resolution, max_points
+    )
 
-def generate_raising_india_graph_data(years=5):
-    """Generate graph data for Raising India Basket from Excel with absolute returns only"""
-    df = raising_india_df.copy()
-    
-    # Filter data based on years requested
-    cutoff_date = df['DATE'].max() - pd.DateOffset(years=years)
-    df_filtered = df[df['DATE'] >= cutoff_date].copy()
-    
-    # Resample to monthly data
-    df_filtered.set_index('DATE', inplace=True)
-    df_monthly = df_filtered.resample('MS').first()
-    df_monthly.reset_index(inplace=True)
-    
-    # Prepare absolute returns data
-    labels = df_monthly['DATE'].dt.strftime('%b %Y').tolist()
-    
-    # Get basket NAV and Nifty 50 values and normalize to 100 at start
-    basket_navs_raw = df_monthly['Weightage NAV'].ffill()
-    nifty_navs_raw = df_monthly['NIFTY 50'].ffill()
-    
-    # Normalize both to 100 at the start of the filtered period
-    basket_base = basket_navs_raw.iloc[0]
-    nifty_base = nifty_navs_raw.iloc[0]
-    basket_navs = ((basket_navs_raw / basket_base) * 100).tolist()
-    nifty_navs = ((nifty_navs_raw / nifty_base) * 100).tolist()
-    
-    # Calculate rolling returns from absolute data
-    rolling_labels = []
-    rolling_basket = []
-    rolling_nifty = []
-    
-    # Use the full dataset for rolling calculations
-    df_full = df.copy()
-    df_full = df_full.sort_values('DATE')
-    
+def generate_raising_india_graph_data(years=5, start=None, end=None, resolution=None, max_points=None, series=None):
+    """Generate graph data for Raising India Basket from Excel with absolute and rolling returns"""
+    series = served_series['raising_india'] if series is None else series
     if years == 1:
-        periods = 252  # ~1 year of trading days
+        months = 12
     elif years == 3:
-        periods = 756  # ~3 years of trading days
+        months = 36
     else:
-        periods = 1260  # ~5 years of trading days
-    
-    # Calculate rolling returns
-    for i in range(periods, len(df_full)):
-        date = df_full.iloc[i]['DATE']
-        basket_current = df_full.iloc[i]['Weightage NAV']
-        basket_past = df_full.iloc[i - periods]['Weightage NAV']
-        nifty_current = df_full.iloc[i]['NIFTY 50']
-        nifty_past = df_full.iloc[i - periods]['NIFTY 50']
-        
-        if basket_past > 0 and nifty_past > 0:
-            basket_return = ((basket_current / basket_past) ** (1 / years) - 1) * 100
-            nifty_return = ((nifty_current / nifty_past) ** (1 / years) - 1) * 100
-            
-            rolling_labels.append(date.strftime('%b %Y'))
-            rolling_basket.append(round(basket_return, 2))
-            rolling_nifty.append(round(nifty_return, 2))
+        months = 60
     
-    return {
-        'absoluteReturns': {
-            'labels': labels,
-            'basketData': [round(v, 2) for v in basket_navs],
-            'niftyData': [round(v, 2) for v in nifty_navs]
-        },
-        'rollingReturns': {
-            'labels': rolling_labels,
-            'basketData': rolling_basket,
-            'niftyData': rolling_nifty
-        }
-    }
+    return generate_basket_graph_data(
+        series, years, start, end,
+        resolution, max_points, label_format='%b %Y',
+        rolling_months=months, rolling_from_cutoff=False
+    )
 
-def generate_conservative_basket_graph_data(years=5):
+def generate_conservative_basket_graph_data(years=5, start=None, end=None, resolution=None, max_points=None, series=None):
     """Generate graph data for Conservative Basket with both absolute and rolling returns"""
-    df = conservative_basket_df.copy()
-    
-    # Filter data based on years requested
-    cutoff_date = df['DATE'].max() - pd.DateOffset(years=years)
-    df_filtered = df[df['DATE'] >= cutoff_date].copy()
-    
-    # Resample to monthly data
-    df_filtered.set_index('DATE', inplace=True)
-    df_monthly = df_filtered.resample('MS').first()
-    df_monthly.reset_index(inplace=True)
-    
-    # Prepare absolute returns data
-    labels = df_monthly['DATE'].dt.strftime('%b %y').tolist()
-    
-    # Get basket NAV and Nifty 50 values
-    basket_navs_raw = df_monthly['Basket_NAV'].ffill()
-    nifty_navs_raw = df_monthly['NIFTY_50'].ffill()
-    
-    # Normalize to 100 at the start
-    basket_base = basket_navs_raw.iloc[0]
-    nifty_base = nifty_navs_raw.iloc[0]
-    basket_navs = ((basket_navs_raw / basket_base) * 100).tolist()
-    nifty_navs = ((nifty_navs_raw / nifty_base) * 100).tolist()
-    
-    # Calculate rolling returns
-    rolling_window = years * 12
-    rolling_labels = []
-    rolling_basket = []
-    rolling_nifty = []
-    
-    df_full = conservative_basket_df.copy()
-    df_full = df_full.sort_values('DATE')
-    
-    for i in range(rolling_window, len(df_full)):
-        current_date = df_full.iloc[i]['DATE']
-        basket_current = df_full.iloc[i]['Basket_NAV']
-        basket_past = df_full.iloc[i - rolling_window]['Basket_NAV']
-        nifty_current = df_full.iloc[i]['NIFTY_50']
-        nifty_past = df_full.iloc[i - rolling_window]['NIFTY_50']
-        
-        basket_cagr = ((basket_current / basket_past) ** (1 / years) - 1) * 100
-        nifty_cagr = ((nifty_current / nifty_past) ** (1 / years) - 1) * 100
-        
-        if current_date >= cutoff_date:
-            rolling_labels.append(current_date.strftime('%b %Y'))
-            rolling_basket.append(round(basket_cagr, 2))
-            rolling_nifty.append(round(nifty_cagr, 2))
-    
-    return {
-        'absoluteReturns': {
-            'labels': labels,
-            'basketData': [round(float(v), 2) if not np.isnan(v) else 0 for v in basket_navs],
-            'niftyData': [round(float(v), 2) if not np.isnan(v) else 0 for v in nifty_navs]
-        },
-        'rollingReturns': {
-            'labels': rolling_labels,
-            'basketData': rolling_basket,
-            'niftyData': rolling_nifty
-        }
-    }
+    series = served_series['conservative_basket'] if series is None else series
+    return generate_basket_graph_data(
+        series, years, start, end,
+        resolution, max_points
+    )
 
-def generate_dusshera_basket_graph_data(years=5):
+def generate_dusshera_basket_graph_data(years=5, start=None, end=None, resolution=None, max_points=None, series=None):
     """Generate graph data for Dusshera Basket with both absolute and rolling returns"""
-    df = dusshera_basket_df.copy()
-    
-    # Filter data based on years requested
-    cutoff_date = df['DATE'].max() - pd.DateOffset(years=years)
-    df_filtered = df[df['DATE'] >= cutoff_date].copy()
-    
-    # Resample to monthly data
-    df_filtered.set_index('DATE', inplace=True)
-    df_monthly = df_filtered.resample('MS').first()
-    df_monthly.reset_index(inplace=True)
-    
-    # Prepare absolute returns data
-    labels = df_monthly['DATE'].dt.strftime('%b %y').tolist()
-    
-    # Get basket NAV and Nifty 50 values
-    basket_navs_raw = df_monthly['Basket_NAV'].ffill()
-    nifty_navs_raw = df_monthly['NIFTY_50'].ffill()
-    
-    # Normalize to 100 at the start
-    basket_base = basket_navs_raw.iloc[0]
-    nifty_base = nifty_navs_raw.iloc[0]
-    basket_navs = ((basket_navs_raw / basket_base) * 100).tolist()
-    nifty_navs = ((nifty_navs_raw / nifty_base) * 100).tolist()
-    
-    # Calculate rolling returns
-    rolling_window = years * 12
-    rolling_labels = []
-    rolling_basket = []
-    rolling_nifty = []
-    
-    df_full = dusshera_basket_df.copy()
-    df_full = df_full.sort_values('DATE')
-    
-    for i in range(rolling_window, len(df_full)):
-        current_date = df_full.iloc[i]['DATE']
-        basket_current = df_full.iloc[i]['Basket_NAV']
-        basket_past = df_full.iloc[i - rolling_window]['Basket_NAV']
-        nifty_current = df_full.iloc[i]['NIFTY_50']
-        nifty_past = df_full.iloc[i - rolling_window]['NIFTY_50']
-        
-        basket_cagr = ((basket_current / basket_past) ** (1 / years) - 1) * 100
-        nifty_cagr = ((nifty_current / nifty_past) ** (1 / years) - 1) * 100
-        
-        if current_date >= cutoff_date:
-            rolling_labels.append(current_date.strftime('%b %Y'))
-            rolling_basket.append(round(basket_cagr, 2))
-            rolling_nifty.append(round(nifty_cagr, 2))
-    
-    return {
-        'absoluteReturns': {
-            'labels': labels,
-            'basketData': [round(float(v), 2) if not np.isnan(v) else 0 for v in basket_navs],
-            'niftyData': [round(float(v), 2) if not np.isnan(v) else 0 for v in nifty_navs]
-        },
-        'rollingReturns': {
-            'labels': rolling_labels,
-            'basketData': rolling_basket,
-            'niftyData': rolling_nifty
-        }
-    }
+    series = served_series['dusshera_basket'] if series is None else series
+    return generate_basket_graph_data(
+        series, years, start, end,
+        resolution, max_points
+    )
 
-def generate_yellow_basket_graph_data(years=5):
+def generate_yellow_basket_graph_data(years=5, start=None, end=None, resolution=None, max_points=None, series=None):
     """Generate graph data for Yellow Basket with both absolute and rolling returns"""
-    df = yellow_basket_df.copy()
-    
-    # Filter data based on years requested
-    cutoff_date = df['DATE'].max() - pd.DateOffset(years=years)
-    df_filtered = df[df['DATE'] >= cutoff_date].copy()
-    
-    # Resample to monthly data
-    df_filtered.set_index('DATE', inplace=True)
-    df_monthly = df_filtered.resample('MS').first()
-    df_monthly.reset_index(inplace=True)
-    
-    # Prepare absolute returns data
-    labels = df_monthly['DATE'].dt.strftime('%b %y').tolist()
-    
-    # Get basket NAV and Nifty 50 values
-    basket_navs_raw = df_monthly['Basket_NAV'].ffill()
-    nifty_navs_raw = df_monthly['NIFTY_50'].ffill()
-    
-    # Normalize to 100 at the start
-    basket_base = basket_navs_raw.iloc[0]
-    nifty_base = nifty_navs_raw.iloc[0]
-    basket_navs = ((basket_navs_raw / basket_base) * 100).tolist()
-    nifty_navs = ((nifty_navs_raw / nifty_base) * 100).tolist()
-    
-    # Calculate rolling returns
-    rolling_window = years * 12
-    rolling_labels = []
-    rolling_basket = []
-    rolling_nifty = []
-    
-    df_full = yellow_basket_df.copy()
-    df_full = df_full.sort_values('DATE')
-    
-    for i in range(rolling_window, len(df_full)):
-        current_date = df_full.iloc[i]['DATE']
-        basket_current = df_full.iloc[i]['Basket_NAV']
-        basket_past = df_full.iloc[i - rolling_window]['Basket_NAV']
-        nifty_current = df_full.iloc[i]['NIFTY_50']
-        nifty_past = df_full.iloc[i - rolling_window]['NIFTY_50']
-        
-        basket_cagr = ((basket_current / basket_past) ** (1 / years) - 1) * 100
-        nifty_cagr = ((nifty_current / nifty_past) ** (1 / years) - 1) * 100
-        
-        if current_date >= cutoff_date:
-            rolling_labels.append(current_date.strftime('%b %Y'))
-            rolling_basket.append(round(basket_cagr, 2))
-            rolling_nifty.append(round(nifty_cagr, 2))
-    
-    return {
-        'absoluteReturns': {
-            'labels': labels,
-            'basketData': [round(float(v), 2) if not np.isnan(v) else 0 for v in basket_navs],
-            'niftyData': [round(float(v), 2) if not np.isnan(v) else 0 for v in nifty_navs]
-        },
-        'rollingReturns': {
-            'labels': rolling_labels,
-            'basketData': rolling_basket,
-            'niftyData': rolling_nifty
-        }
-    }
+    series = served_series['yellow_basket'] if series is None else series
+    return generate_basket_graph_data(
+        series, years, start, end,
+        resolution, max_points
+    )
 
-@app.route('/api/baskets/great-india', methods=['GET'])
-def get_great_india_basket():
-    """Get Great India Basket data with absolute and rolling returns"""
-    
-    years = request.args.get('years', default=5, type=int)
+def build_great_india_basket(years=5, start=None, end=None, resolution=None, max_points=None, risk_window=None, series=None):
+    """Build Great India Basket payload with absolute and rolling returns"""
+    series = served_series['great_india'] if series is None else series
     
     # Generate graph data with both absolute and rolling returns
-    graph_data = generate_great_india_graph_data(years=years)
-    
-    # Calculate metrics from absolute returns
-    basket_navs = graph_data['absoluteReturns']['basketData']
-    
-    # Calculate CAGR
-    if len(basket_navs) >= 12:
-        cagr1Y = round(((basket_navs[-1] / basket_navs[-12]) ** (1/1) - 1) * 100, 2) if len(basket_navs) >= 12 else 0
-    else:
-        cagr1Y = 0
-    
-    if len(basket_navs) >= 36:
-        cagr3Y = round(((basket_navs[-1] / basket_navs[-36]) ** (1/3) - 1) * 100, 2)
-    else:
-        cagr3Y = 0
+    graph_data = generate_great_india_graph_data(years, start, end, resolution, max_points, series=series)
     
-    if len(basket_navs) >= 60:
-        cagr5Y = round(((basket_navs[-1] / basket_navs[-60]) ** (1/5) - 1) * 100, 2)
-    else:
-        cagr5Y = 0
+    # Calculate CAGR from the daily NAVs, looking back whole calendar years from the window end
+    basket_navs = series.basket
+    row = series.index.row_at(end)
+    risk = series.risk_metrics(row)
+    volatility, sharpe = headline_risk(risk)
+    cagr1Y = trailing_cagr(basket_navs, series.index, row, 1)
+    cagr3Y = trailing_cagr(basket_navs, series.index, row, 3)
+    cagr5Y = trailing_cagr(basket_navs, series.index, row, 5)
     
     basket_data = {
         'id': 'b14',
@@ -839,11 +608,14 @@ def get_great_india_basket():
             'cagr1Y': cagr1Y,
             'cagr3Y': cagr3Y,
             'cagr5Y': cagr5Y,
-            'risk': 12.5,
-            'sharpe': 0.85
+            'risk': volatility,
+            'sharpe': sharpe
         },
+        'riskMetrics': risk,
+        'relativeMetrics': series.relative_metrics(row),
         
         'graphData': graph_data,
+        'rollingRisk': rolling_risk_chart(series, years, start, end, resolution, max_points, risk_window),
         
         'funds': GREAT_INDIA_FUNDS,
         
@@ -855,24 +627,24 @@ def get_great_india_basket():
         'rebalancingFrequency': 'Quarterly'
     }
     
-    return jsonify(basket_data)
+    return basket_data
 
-@app.route('/api/baskets/conservative-balanced', methods=['GET'])
-def get_conservative_balanced_basket():
-    """Get Conservative Balanced Basket data with calculations"""
-    
-    # Get years parameter from query string (default: 5)
-    years = request.args.get('years', default=5, type=int)
+def build_conservative_balanced_basket(years=5, start=None, end=None, resolution=None, max_points=None, risk_window=None, series=None):
+    """Build Conservative Balanced Basket payload with calculations"""
+    series = served_series['nifty'] if series is None else series
     
     # Calculate weighted metrics
     metrics = calculate_weighted_metrics(CONSERVATIVE_BALANCED_FUNDS)
     
     # Generate graph data
-    graph_data = generate_nav_based_graph_data(CONSERVATIVE_BALANCED_FUNDS, years=years)
+    graph_data = generate_nav_based_graph_data(CONSERVATIVE_BALANCED_FUNDS, years, start, end, nifty=series)
     
     # Calculate period returns from NAV
     period_returns = calculate_returns_from_nav(graph_data['basketData'])
     
+    # The series is synthetic and monthly, so only max_points applies to the chart
+    graph_data = downsample_graph(graph_data, max_points)
+    
     basket_data = {
         'id': 'b10',
         'name': 'Conservative Balanced Basket',
@@ -904,36 +676,23 @@ def get_conservative_balanced_basket():
         'rebalancingFrequency': 'Half-yearly'
     }
     
-    return jsonify(basket_data)
+    return basket_data
 
-@app.route('/api/baskets/aggressive-hybrid', methods=['GET'])
-def get_aggressive_hybrid_basket():
-    """Get Aggressive Hybrid Basket data with absolute and rolling returns"""
-    
-    # Get years parameter from query string (default: 5)
-    years = request.args.get('years', default=5, type=int)
+def build_aggressive_hybrid_basket(years=5, start=None, end=None, resolution=None, max_points=None, risk_window=None, series=None):
+    """Build Aggressive Hybrid Basket payload with absolute and rolling returns"""
+    series = served_series['aggressive_basket'] if series is None else series
     
     # Generate graph data with both absolute and rolling returns
-    graph_data = generate_aggressive_hybrid_graph_data(years=years)
+    graph_data = generate_aggressive_hybrid_graph_data(years, start, end, resolution, max_points, series=series)
     
-    # Calculate metrics from absolute returns
-    basket_navs = graph_data['absoluteReturns']['basketData']
-    
-    # Calculate CAGR
-    if len(basket_navs) >= 12:
-        cagr1Y = round(((basket_navs[-1] / basket_navs[-12]) ** (1/1) - 1) * 100, 2) if len(basket_navs) >= 12 else 0
-    else:
-        cagr1Y = 0
-    
-    if len(basket_navs) >= 36:
-        cagr3Y = round(((basket_navs[-1] / basket_navs[-36]) ** (1/3) - 1) * 100, 2)
-    else:
-        cagr3Y = 0
-    
-    if len(basket_navs) >= 60:
-        cagr5Y = round(((basket_navs[-1] / basket_navs[-60]) ** (1/5) - 1) * 100, 2)
-    else:
-        cagr5Y = 0
+    # Calculate CAGR from the daily NAVs, looking back whole calendar years from the window end
+    basket_navs = series.basket
+    row = series.index.row_at(end)
+    risk = series.risk_metrics(row)
+    volatility, sharpe = headline_risk(risk)
+    cagr1Y = trailing_cagr(basket_navs, series.index, row, 1)
+    cagr3Y = trailing_cagr(basket_navs, series.index, row, 3)
+    cagr5Y = trailing_cagr(basket_navs, series.index, row, 5)
     
     AGGRESSIVE_HYBRID_FUNDS = [
         {'id': 'f11', 'name': 'HDFC Hybrid Equity Fund(G)', 'incpRet': 12.82, 'ret3Y': 11.6, 'ret5Y': 14.97, 'std': 9.9, 'sharpe': 0, 'expenseRatio': 1.68, 'allocation': 16.67},
@@ -960,11 +719,14 @@ def get_aggressive_hybrid_basket():
             'cagr1Y': cagr1Y,
             'cagr3Y': cagr3Y,
             'cagr5Y': cagr5Y,
-            'risk': 10.5,
-            'sharpe': 0.75
+            'risk': volatility,
+            'sharpe': sharpe
         },
+        'riskMetrics': risk,
+        'relativeMetrics': series.relative_metrics(row),
         
         'graphData': graph_data,
+        'rollingRisk': rolling_risk_chart(series, years, start, end, resolution, max_points, risk_window),
         
         'funds': AGGRESSIVE_HYBRID_FUNDS,
         
@@ -976,36 +738,37 @@ def get_aggressive_hybrid_basket():
         'rebalancingFrequency': 'Quarterly'
     }
     
-    return jsonify(basket_data)
+    return basket_data
 
-def generate_excel_based_graph_data(excel_df, basket_column, years=5):
+def generate_excel_based_graph_data(series, years=5, start=None, end=None, resolution=None, max_points=None):
     """Generate graph data from Excel NAV data"""
-    # Filter data for the requested time period
-    end_date = excel_df['DATE'].max()
-    start_date = end_date - pd.DateOffset(years=years)
-    period_df = excel_df[excel_df['DATE'] >= start_date].copy()
-    
-    # Resample to monthly
-    period_df['year_month'] = period_df['DATE'].dt.to_period('M')
-    monthly_df = period_df.groupby('year_month').agg({
-        basket_column: 'last',
-        'NIFTY 50': 'last'
-    }).reset_index()
-    
-    monthly_df['year_month'] = monthly_df['year_month'].astype(str)
+    # Slice the requested time period by binary search on the sorted date index
+    lo, hi = resolve_date_window(series.index, years, start, end)
+    if lo >= hi:
+        return {'labels': [], 'basketData': [], 'niftyData': []}
+    window_dates = series.dates[lo:hi]
+    
+    # Last value of each month (or week/day)
+    resolution = resolution or 'monthly'
+    starts = series.bucket_starts(lo, hi, resolution)
+    if resolution == 'monthly':
+        labels = series.labels_at(lo + starts, '%Y-%m')
+    else:
+        labels = format_day_labels(window_dates[starts], '%Y-%m-%d')
+    last_rows = lo + np.r_[starts[1:], hi - lo] - 1
+    # float64 before rounding, so float32 NAVs (ALPHANIFTY_NAV_DTYPE) round to 2dp in the JSON too
+    basket_values = series.basket[last_rows].astype(np.float64)
+    nifty_values = series.nifty[last_rows].astype(np.float64)
     
     # Normalize to base 100
-    base_basket = monthly_df[basket_column].iloc[0]
-    base_nifty = monthly_df['NIFTY 50'].iloc[0]
-    
-    basket_navs = ((monthly_df[basket_column] / base_basket) * 100).round(2).tolist()
-    nifty_navs = ((monthly_df['NIFTY 50'] / base_nifty) * 100).round(2).tolist()
+    basket_navs = np.round((basket_values / basket_values[0]) * 100, 2).tolist()
+    nifty_navs = np.round((nifty_values / nifty_values[0]) * 100, 2).tolist()
     
-    return {
-        'labels': monthly_df['year_month'].tolist(),
+    return downsample_graph({
+        'labels': labels,
         'basketData': basket_navs,
         'niftyData': nifty_navs
-    }
+    }, max_points, x=window_dates[starts].astype('datetime64[D]').astype(np.float64))
 
 # White Basket Configuration
 WHITE_BASKET_FUNDS = [
@@ -1038,76 +801,27 @@ RAISING_INDIA_FUNDS = [
     {'id': 'ri3', 'name': 'ICICI Pru Housing Opp Fund-Reg(G)', 'allocation': 33.34}
 ]
 
-def generate_great_india_data(years=5):
-    """Generate both absolute and rolling returns data for Great India Basket"""
-    # Filter data for the requested time period
-    end_date = great_india_df['DATE'].max()
-    start_date = end_date - pd.DateOffset(years=years)
-    
-    # Filter the dataframe
-    filtered_df = great_india_df[great_india_df['DATE'] >= start_date].copy()
-    
-    # Resample to monthly for better visualization
-    filtered_df['year_month'] = filtered_df['DATE'].dt.to_period('M')
-    monthly_df = filtered_df.groupby('year_month').last().reset_index()
-    monthly_df['year_month'] = monthly_df['year_month'].astype(str)
-    
-    # Prepare absolute returns data
-    absolute_data = {
-        'labels': monthly_df['year_month'].tolist(),
-        'basketData': monthly_df['Basket_NAV'].round(2).tolist(),
-        'niftyData': monthly_df['NIFTY_50'].round(2).tolist()
-    }
-    
-    # Prepare rolling returns data based on years
-    if years == 3:
-        rolling_col_basket = '1Y_Basket_Rolling'
-        rolling_col_nifty = '1Y_Nifty_Rolling'
-    elif years == 5:
-        rolling_col_basket = '3Y_Basket_Rolling'
-        rolling_col_nifty = '3Y_Nifty_Rolling'
-    else:  # 10 years
-        rolling_col_basket = '5Y_Basket_Rolling'
-        rolling_col_nifty = '5Y_Nifty_Rolling'
-    
-    rolling_data = {
-        'labels': monthly_df['year_month'].tolist(),
-        'basketData': (monthly_df[rolling_col_basket] * 100).round(2).tolist(),  # Convert to percentage
-        'niftyData': (monthly_df[rolling_col_nifty] * 100).round(2).tolist()  # Convert to percentage
-    }
-    
-    # Calculate metrics
-    latest_nav = filtered_df['Basket_NAV'].iloc[-1]
-    start_nav = filtered_df['Basket_NAV'].iloc[0]
-    total_return = ((latest_nav - start_nav) / start_nav) * 100
-    cagr = ((latest_nav / start_nav) ** (1/years) - 1) * 100
-    
-    return {
-        'absolute': absolute_data,
-        'rolling': rolling_data,
-        'metrics': {
-            'totalReturn': round(total_return, 2),
-            'cagr': round(cagr, 2)
-        }
-    }
-
-@app.route('/api/baskets/white-basket', methods=['GET'])
-def get_white_basket():
-    """Get White Basket (Equity Savings) data"""
-    years = request.args.get('years', default=5, type=int)
+def build_white_basket(years=5, start=None, end=None, resolution=None, max_points=None, risk_window=None, series=None):
+    """Build White Basket (Equity Savings) payload"""
+    series = served_series['white_basket'] if series is None else series
     
     # Generate simple graph data (White Basket doesn't have rolling returns in original implementation)
     graph_data = generate_excel_based_graph_data(
-        white_basket_df, 
-        'Basket_NAV', 
-        years=years
+        series,
+        years=years,
+        start=start,
+        end=end,
+        resolution=resolution,
+        max_points=max_points
     )
-    period_returns = calculate_returns_from_nav(graph_data['basketData'])
     
-    # Calculate metrics from actual NAV data
-    latest_nav = white_basket_df['Basket_NAV'].iloc[-1]
-    year_ago_nav = white_basket_df['Basket_NAV'].iloc[-252] if len(white_basket_df) > 252 else white_basket_df['Basket_NAV'].iloc[0]
-    cagr_1y = ((latest_nav / year_ago_nav) - 1) * 100
+    # Calculate period returns and CAGR from the daily NAVs at the end of the window
+    basket_navs = series.basket
+    row = series.index.row_at(end)
+    risk = series.risk_metrics(row)
+    volatility, sharpe = headline_risk(risk)
+    period_returns = trailing_returns(basket_navs, series.index, row)
+    cagr_1y = trailing_cagr(basket_navs, series.index, row, 1)
     
     basket_data = {
         'id': 'b11',
@@ -1125,12 +839,15 @@ def get_white_basket():
             'cagr1Y': round(cagr_1y, 2),
             'cagr3Y': round(period_returns.get('3Y', 0), 2),
             'cagr5Y': round(period_returns.get('5Y', 0), 2),
-            'risk': 5.5,
-            'sharpeRatio': 0.8,
+            'risk': volatility,
+            'sharpeRatio': sharpe,
             'expenseRatio': 1.2
         },
+        'riskMetrics': risk,
+        'relativeMetrics': series.relative_metrics(row),
         'periodReturns': period_returns,
         'graphData': graph_data,
+        'rollingRisk': rolling_risk_chart(series, years, start, end, resolution, max_points, risk_window),
         'funds': WHITE_BASKET_FUNDS,
         
         'rationale': 'White Basket is designed for ultra-conservative investors seeking better-than-FD returns with minimal risk. Comprising three top equity savings funds from Kotak, HDFC, and ICICI, this basket maintains 20-30% equity exposure while the rest is in debt and arbitrage. Perfect for parking funds, emergency corpus, or near-term goals where capital safety is paramount.',
@@ -1141,23 +858,22 @@ def get_white_basket():
         'rebalancingFrequency': 'Annually'
     }
     
-    return jsonify(basket_data)
+    return basket_data
 
-@app.route('/api/baskets/every-common-india', methods=['GET'])
-def get_every_common_india():
-    """Get Every Common India Basket data with absolute and rolling returns"""
-    years = request.args.get('years', default=5, type=int)
+def build_every_common_india_basket(years=5, start=None, end=None, resolution=None, max_points=None, risk_window=None, series=None):
+    """Build Every Common India Basket payload with absolute and rolling returns"""
+    series = served_series['every_common'] if series is None else series
     
     # Generate graph data with both absolute and rolling returns
-    graph_data = generate_every_common_india_graph_data(years)
-    
-    # Calculate period returns from absolute returns data
-    period_returns = calculate_returns_from_nav(graph_data['absoluteReturns']['basketData'])
+    graph_data = generate_every_common_india_graph_data(years, start, end, resolution, max_points, series=series)
     
-    # Calculate metrics from actual NAV data
-    latest_nav = every_common_df['Basket NAV Every Common India'].iloc[-1]
-    year_ago_nav = every_common_df['Basket NAV Every Common India'].iloc[-252] if len(every_common_df) > 252 else every_common_df['Basket NAV Every Common India'].iloc[0]
-    cagr_1y = ((latest_nav / year_ago_nav) - 1) * 100
+    # Calculate period returns and CAGR from the daily NAVs at the end of the window
+    basket_navs = series.basket
+    row = series.index.row_at(end)
+    risk = series.risk_metrics(row)
+    volatility, sharpe = headline_risk(risk)
+    period_returns = trailing_returns(basket_navs, series.index, row)
+    cagr_1y = trailing_cagr(basket_navs, series.index, row, 1)
     
     basket_data = {
         'id': 'b12',
@@ -1175,12 +891,15 @@ def get_every_common_india():
             'cagr1Y': round(cagr_1y, 2),
             'cagr3Y': round(period_returns.get('3Y', 0), 2),
             'cagr5Y': round(period_returns.get('5Y', 0), 2),
-            'risk': 15.5,
-            'sharpeRatio': 0.65,
+            'risk': volatility,
+            'sharpeRatio': sharpe,
             'expenseRatio': 0.85
         },
+        'riskMetrics': risk,
+        'relativeMetrics': series.relative_metrics(row),
         'periodReturns': period_returns,
         'graphData': graph_data,
+        'rollingRisk': rolling_risk_chart(series, years, start, end, resolution, max_points, risk_window),
         'funds': EVERY_COMMON_INDIA_FUNDS,
         
         'rationale': 'Every Common India represents the true spirit of Indian growth story—from the stability of Nifty 50 to the dynamism of small caps. This basket captures opportunities across market capitalizations: large caps for stability (Nippon Nifty 50 ETF, ICICI Large Cap), flexi cap for tactical allocation (Aditya Birla), mid caps for emerging champions (Nippon Mid Cap), and small caps for explosive growth (Nippon Small Cap). It\'s India\'s complete equity exposure in one basket.',
@@ -1191,43 +910,32 @@ def get_every_common_india():
         'rebalancingFrequency': 'Annually'
     }
     
-    return jsonify(basket_data)
+    return basket_data
 
-@app.route('/api/baskets/raising-india', methods=['GET'])
-def get_raising_india():
-    """Get Raising India Basket data with absolute and rolling returns"""
-    years = request.args.get('years', default=5, type=int)
+def build_raising_india_basket(years=5, start=None, end=None, resolution=None, max_points=None, risk_window=None, series=None):
+    """Build Raising India Basket payload with absolute and rolling returns"""
+    series = served_series['raising_india'] if series is None else series
     
     # Generate graph data with both absolute and rolling returns
-    graph_data = generate_raising_india_graph_data(years=years)
+    graph_data = generate_raising_india_graph_data(years, start, end, resolution, max_points, series=series)
     
     # Calculate metrics from actual raw data (not filtered monthly data)
-    df = raising_india_df.copy()
-    latest_nav = df['Weightage NAV'].iloc[-1]
-    
-    # Calculate CAGR from available data
-    if len(df) >= 252:  # ~1 year of trading days
-        year_ago_nav = df['Weightage NAV'].iloc[-252]
-        cagr1Y = round(((latest_nav / year_ago_nav) - 1) * 100, 2)
-    else:
-        cagr1Y = 0
-    
-    if len(df) >= 756:  # ~3 years of trading days
-        three_years_ago_nav = df['Weightage NAV'].iloc[-756]
-        cagr3Y = round(((latest_nav / three_years_ago_nav) ** (1/3) - 1) * 100, 2)
-    else:
-        cagr3Y = 0
-    
-    if len(df) >= 1260:  # ~5 years of trading days
-        five_years_ago_nav = df['Weightage NAV'].iloc[-1260]
-        cagr5Y = round(((latest_nav / five_years_ago_nav) ** (1/5) - 1) * 100, 2)
-    else:
+    basket_navs = series.basket
+    row = series.index.row_at(end)
+    risk = series.risk_metrics(row)
+    volatility, sharpe = headline_risk(risk)
+    
+    # Calculate CAGR over whole calendar years back from the latest NAV
+    cagr1Y = trailing_cagr(basket_navs, series.index, row, 1)
+    cagr3Y = trailing_cagr(basket_navs, series.index, row, 3)
+    cagr5Y = trailing_cagr(basket_navs, series.index, row, 5, default=None)
+    if cagr5Y is None:
         # Calculate CAGR for available period
-        first_nav = df['Weightage NAV'].iloc[0]
-        days_diff = (df['DATE'].iloc[-1] - df['DATE'].iloc[0]).days
+        first_nav = basket_navs[0]
+        days_diff = (series.index.dates[row] - series.index.first) / np.timedelta64(1, 'D') if row is not None else 0
         years_diff = days_diff / 365.25
         if years_diff > 0 and first_nav > 0:
-            cagr5Y = round(((latest_nav / first_nav) ** (1/years_diff) - 1) * 100, 2)
+            cagr5Y = round(((basket_navs[row] / first_nav) ** (1/years_diff) - 1) * 100, 2)
         else:
             cagr5Y = 0
     
@@ -1247,12 +955,15 @@ def get_raising_india():
             'cagr1Y': cagr1Y,
             'cagr3Y': cagr3Y,
             'cagr5Y': cagr5Y,
-            'risk': 18.5,
-            'sharpeRatio': 0.45,
+            'risk': volatility,
+            'sharpeRatio': sharpe,
             'expenseRatio': 2.1
         },
+        'riskMetrics': risk,
+        'relativeMetrics': series.relative_metrics(row),
         
         'graphData': graph_data,
+        'rollingRisk': rolling_risk_chart(series, years, start, end, resolution, max_points, risk_window),
         'funds': RAISING_INDIA_FUNDS,
         
         'rationale': 'Raising India captures the government\'s trillion-dollar infrastructure push. With defense modernization (HDFC Defence), power & infrastructure capex (Nippon Power & Infra), and housing boom (ICICI Housing Opportunities), this basket is positioned at the heart of India\'s nation-building initiatives. These thematic funds benefit from multi-year structural tailwinds—defense indigenization, renewable energy transition, and affordable housing mission.',
@@ -1263,37 +974,24 @@ def get_raising_india():
         'rebalancingFrequency': 'Half-yearly'
     }
     
-    return jsonify(basket_data)
+    return basket_data
 
-@app.route('/api/baskets/conservative', methods=['GET'])
-def get_conservative_basket():
-    """Get Conservative Basket data with absolute and rolling returns"""
-    years = request.args.get('years', default=5, type=int)
+def build_conservative_basket(years=5, start=None, end=None, resolution=None, max_points=None, risk_window=None, series=None):
+    """Build Conservative Basket payload with absolute and rolling returns"""
+    series = served_series['conservative_basket'] if series is None else series
     
-    graph_data = generate_conservative_basket_graph_data(years)
+    graph_data = generate_conservative_basket_graph_data(years, start, end, resolution, max_points, series=series)
     
     # Calculate metrics
-    df = conservative_basket_df.copy()
-    latest_nav = df['Basket_NAV'].iloc[-1]
+    basket_navs = series.basket
+    row = series.index.row_at(end)
+    risk = series.risk_metrics(row)
+    volatility, sharpe = headline_risk(risk)
     
-    # Calculate CAGRs
-    if len(df) >= 252:
-        year_ago_nav = df['Basket_NAV'].iloc[-252]
-        cagr1Y = round(((latest_nav / year_ago_nav) - 1) * 100, 2)
-    else:
-        cagr1Y = 0
-    
-    if len(df) >= 756:
-        three_years_ago_nav = df['Basket_NAV'].iloc[-756]
-        cagr3Y = round(((latest_nav / three_years_ago_nav) ** (1/3) - 1) * 100, 2)
-    else:
-        cagr3Y = 0
-    
-    if len(df) >= 1260:
-        five_years_ago_nav = df['Basket_NAV'].iloc[-1260]
-        cagr5Y = round(((latest_nav / five_years_ago_nav) ** (1/5) - 1) * 100, 2)
-    else:
-        cagr5Y = 0
+    # Calculate CAGRs over whole calendar years back from the latest NAV
+    cagr1Y = trailing_cagr(basket_navs, series.index, row, 1)
+    cagr3Y = trailing_cagr(basket_navs, series.index, row, 3)
+    cagr5Y = trailing_cagr(basket_navs, series.index, row, 5)
     
     basket_data = {
         'id': 'b10',
@@ -1311,12 +1009,15 @@ def get_conservative_basket():
             'cagr1Y': cagr1Y,
             'cagr3Y': cagr3Y,
             'cagr5Y': cagr5Y,
-            'risk': 10.5,
-            'sharpeRatio': 0.85,
+            'risk': volatility,
+            'sharpeRatio': sharpe,
             'expenseRatio': 1.5
         },
+        'riskMetrics': risk,
+        'relativeMetrics': series.relative_metrics(row),
         
         'graphData': graph_data,
+        'rollingRisk': rolling_risk_chart(series, years, start, end, resolution, max_points, risk_window),
         'funds': CONSERVATIVE_BALANCED_FUNDS,
         
         'rationale': 'Conservative Balanced Basket offers stability without completely sacrificing growth potential. Through balanced advantage funds, it dynamically allocates between equity and debt based on market conditions, providing downside protection while participating in market upswings.',
@@ -1327,37 +1028,24 @@ def get_conservative_basket():
         'rebalancingFrequency': 'Annually'
     }
     
-    return jsonify(basket_data)
+    return basket_data
 
-@app.route('/api/baskets/dusshera', methods=['GET'])
-def get_dusshera_basket():
-    """Get Dusshera Basket data with absolute and rolling returns"""
-    years = request.args.get('years', default=5, type=int)
+def build_dusshera_basket(years=5, start=None, end=None, resolution=None, max_points=None, risk_window=None, series=None):
+    """Build Dusshera Basket payload with absolute and rolling returns"""
+    series = served_series['dusshera_basket'] if series is None else series
     
-    graph_data = generate_dusshera_basket_graph_data(years)
+    graph_data = generate_dusshera_basket_graph_data(years, start, end, resolution, max_points, series=series)
     
     # Calculate metrics
-    df = dusshera_basket_df.copy()
-    latest_nav = df['Basket_NAV'].iloc[-1]
+    basket_navs = series.basket
+    row = series.index.row_at(end)
+    risk = series.risk_metrics(row)
+    volatility, sharpe = headline_risk(risk)
     
-    # Calculate CAGRs
-    if len(df) >= 252:
-        year_ago_nav = df['Basket_NAV'].iloc[-252]
-        cagr1Y = round(((latest_nav / year_ago_nav) - 1) * 100, 2)
-    else:
-        cagr1Y = 0
-    
-    if len(df) >= 756:
-        three_years_ago_nav = df['Basket_NAV'].iloc[-756]
-        cagr3Y = round(((latest_nav / three_years_ago_nav) ** (1/3) - 1) * 100, 2)
-    else:
-        cagr3Y = 0
-    
-    if len(df) >= 1260:
-        five_years_ago_nav = df['Basket_NAV'].iloc[-1260]
-        cagr5Y = round(((latest_nav / five_years_ago_nav) ** (1/5) - 1) * 100, 2)
-    else:
-        cagr5Y = 0
+    # Calculate CAGRs over whole calendar years back from the latest NAV
+    cagr1Y = trailing_cagr(basket_navs, series.index, row, 1)
+    cagr3Y = trailing_cagr(basket_navs, series.index, row, 3)
+    cagr5Y = trailing_cagr(basket_navs, series.index, row, 5)
     
     basket_data = {
         'id': 'b15',
@@ -1375,12 +1063,15 @@ def get_dusshera_basket():
             'cagr1Y': cagr1Y,
             'cagr3Y': cagr3Y,
             'cagr5Y': cagr5Y,
-            'risk': 16.5,
-            'sharpeRatio': 0.65,
+            'risk': volatility,
+            'sharpeRatio': sharpe,
             'expenseRatio': 1.8
         },
+        'riskMetrics': risk,
+        'relativeMetrics': series.relative_metrics(row),
         
         'graphData': graph_data,
+        'rollingRisk': rolling_risk_chart(series, years, start, end, resolution, max_points, risk_window),
         'funds': [],  # Add fund allocation details as needed
         
         'rationale': 'Dusshera Basket embodies the spirit of victory and prosperity. Launched during the auspicious festive season, this basket combines growth-oriented funds to help investors achieve their financial goals with conviction and discipline.',
@@ -1391,37 +1082,24 @@ def get_dusshera_basket():
         'rebalancingFrequency': 'Half-yearly'
     }
     
-    return jsonify(basket_data)
+    return basket_data
 
-@app.route('/api/baskets/yellow', methods=['GET'])
-def get_yellow_basket():
-    """Get Yellow Basket data with absolute and rolling returns"""
-    years = request.args.get('years', default=5, type=int)
+def build_yellow_basket(years=5, start=None, end=None, resolution=None, max_points=None, risk_window=None, series=None):
+    """Build Yellow Basket payload with absolute and rolling returns"""
+    series = served_series['yellow_basket'] if series is None else series
     
-    graph_data = generate_yellow_basket_graph_data(years)
+    graph_data = generate_yellow_basket_graph_data(years, start, end, resolution, max_points, series=series)
     
     # Calculate metrics
-    df = yellow_basket_df.copy()
-    latest_nav = df['Basket_NAV'].iloc[-1]
-    
-    # Calculate CAGRs
-    if len(df) >= 252:
-        year_ago_nav = df['Basket_NAV'].iloc[-252]
-        cagr1Y = round(((latest_nav / year_ago_nav) - 1) * 100, 2)
-    else:
-        cagr1Y = 0
+    basket_navs = series.basket
+    row = series.index.row_at(end)
+    risk = series.risk_metrics(row)
+    volatility, sharpe = headline_risk(risk)
     
-    if len(df) >= 756:
-        three_years_ago_nav = df['Basket_NAV'].iloc[-756]
-        cagr3Y = round(((latest_nav / three_years_ago_nav) ** (1/3) - 1) * 100, 2)
-    else:
-        cagr3Y = 0
-    
-    if len(df) >= 1260:
-        five_years_ago_nav = df['Basket_NAV'].iloc[-1260]
-        cagr5Y = round(((latest_nav / five_years_ago_nav) ** (1/5) - 1) * 100, 2)
-    else:
-        cagr5Y = 0
+    # Calculate CAGRs over whole calendar years back from the latest NAV
+    cagr1Y = trailing_cagr(basket_navs, series.index, row, 1)
+    cagr3Y = trailing_cagr(basket_navs, series.index, row, 3)
+    cagr5Y = trailing_cagr(basket_navs, series.index, row, 5)
     
     basket_data = {
         'id': 'b4',
@@ -1439,12 +1117,15 @@ def get_yellow_basket():
             'cagr1Y': cagr1Y,
             'cagr3Y': cagr3Y,
             'cagr5Y': cagr5Y,
-            'risk': 9.5,
-            'sharpeRatio': 0.92,
+            'risk': volatility,
+            'sharpeRatio': sharpe,
             'expenseRatio': 1.4
         },
+        'riskMetrics': risk,
+        'relativeMetrics': series.relative_metrics(row),
         
         'graphData': graph_data,
+        'rollingRisk': rolling_risk_chart(series, years, start, end, resolution, max_points, risk_window),
         'funds': [],  # Add fund allocation details as needed
         
         'rationale': 'Yellow Basket shines with optimism and balance. Perfect for investors seeking steady returns without extreme volatility, this basket provides a sunshine path to short and medium-term financial goals.',
@@ -1455,7 +1136,528 @@ def get_yellow_basket():
         'rebalancingFrequency': 'Annually'
     }
     
-    return jsonify(basket_data)
+    return basket_data
+
+# Parameters a basket payload depends on; also its response cache key
+BasketQuery = namedtuple(
+    'BasketQuery', ['years', 'start', 'end', 'resolution', 'max_points', 'risk_window'],
+    defaults=[None, None, None, None, None]
+)
+
+# Parameters of a drawdown response; also its response cache key
+DrawdownQuery = namedtuple('DrawdownQuery', ['start', 'end', 'top', 'max_points'])
+
+def build_drawdown(name, start=None, end=None, top=DEFAULT_EPISODES, max_points=None, series=None):
+    """Drawdown curve, deepest episodes and time under water of a basket and of NIFTY in start..end"""
+    series = served_series[name] if series is None else series
+    lo, hi = series.index.window(start, end)
+    dates = series.dates[lo:hi]
+    # The series' running peaks are the window's own when it starts at the first row
+    basket_curve, basket = drawdown_summary(dates, series.basket[lo:hi],
+                                            series.basket_peak[lo:hi] if lo == 0 else None, top)
+    nifty_curve, nifty = drawdown_summary(dates, series.nifty[lo:hi],
+                                          series.nifty_peak[lo:hi] if lo == 0 else None, top)
+    curve = downsample_graph({
+        'labels': np.datetime_as_string(dates, unit='D').tolist(),
+        'basketData': np.round(basket_curve * 100, 2).tolist(),
+        'niftyData': np.round(nifty_curve * 100, 2).tolist(),
+    }, max_points, x=dates.astype(np.float64))
+    return {
+        'start': str(dates[0]) if len(dates) else None,
+        'end': str(dates[-1]) if len(dates) else None,
+        'drawdownCurve': curve,
+        'basket': basket,
+        'nifty': nifty,
+    }
+
+def build_rolling_stats(name, series=None):
+    """Distribution of the rolling 1/3/5/7/10Y CAGRs of a basket and of NIFTY over all history"""
+    series = served_series[name] if series is None else series
+    return {
+        'asOf': str(series.index.last),
+        'windows': rolling_distributions(series.dates, series.basket, series.nifty, series.index),
+    }
+
+# Basket payload builders, keyed by the slug used in /api/baskets/<slug>
+BASKET_BUILDERS = {
+    'great-india': build_great_india_basket,
+    'conservative-balanced': build_conservative_balanced_basket,
+    'aggressive-hybrid': build_aggressive_hybrid_basket,
+    'white-basket': build_white_basket,
+    'every-common-india': build_every_common_india_basket,
+    'raising-india': build_raising_india_basket,
+    'conservative': build_conservative_basket,
+    'dusshera': build_dusshera_basket,
+    'yellow': build_yellow_basket,
+}
+
+# Series each payload is built from (passed to its builder as `series`)
+BASKET_SERIES = {
+    'great-india': 'great_india',
+    'conservative-balanced': 'nifty',
+    'aggressive-hybrid': 'aggressive_basket',
+    'white-basket': 'white_basket',
+    'every-common-india': 'every_common',
+    'raising-india': 'raising_india',
+    'conservative': 'conservative_basket',
+    'dusshera': 'dusshera_basket',
+    'yellow': 'yellow_basket',
+}
+
+# Analytics of a basket's daily NAVs served at /api/baskets/<slug>/<view>: builder
+# (called with the series name and the query) and the queries precomputed at load time.
+# Responses are cached as '<slug>/<view>' and dropped together with the basket's payloads.
+ANALYTICS_VIEWS = {
+    'drawdown': (build_drawdown, [DrawdownQuery(None, None, DEFAULT_EPISODES, None)]),
+    'rolling-stats': (build_rolling_stats, [()]),
+}
+
+# Baskets backed by daily NAVs, which the analytics are available for
+ANALYTICS_BASKETS = [slug for slug, name in BASKET_SERIES.items() if served_series[name].basket is not None]
+
+def analytics_builders(view, slugs, series=None):
+    """{'<slug>/<view>': builder} for the analytics baskets among `slugs`, reading `series` when given"""
+    builder = ANALYTICS_VIEWS[view][0]
+    series = series or {}
+    return {
+        f'{slug}/{view}': partial(builder, BASKET_SERIES[slug], series=series.get(BASKET_SERIES[slug]))
+        for slug in slugs if slug in ANALYTICS_BASKETS
+    }
+
+# Finished payloads for the years values the frontend uses are built once here
+response_cache = ResponseCache()
+response_cache.set_version(cache_version(DATA_VERSION, appended_digests))
+response_cache.warm(BASKET_BUILDERS, [BasketQuery(years) for years in PRECOMPUTED_YEARS])
+for view, (_, queries) in ANALYTICS_VIEWS.items():
+    response_cache.warm(analytics_builders(view, ANALYTICS_BASKETS), queries)
+
+def swap_series(series, version):
+    """Serve `series` ({name: BasketSeries}) as data `version`; returns the basket ids rebuilt.
+    
+    Payloads for the baskets built from those series are precomputed off to
+    the side while requests are served from the current ones. served_series
+    is then replaced in one assignment (each builder reads its series once,
+    so a request sees the old or the new basket, never a mix) and the
+    response cache switches to the new version, dropping only those
+    baskets' entries.
+    """
+    global served_series
+    
+    slugs = [slug for slug, name in BASKET_SERIES.items() if name in series]
+    entries = response_cache.precompute(
+        {slug: partial(BASKET_BUILDERS[slug], series=series[BASKET_SERIES[slug]]) for slug in slugs},
+        [BasketQuery(years) for years in PRECOMPUTED_YEARS], version
+    )
+    
+    served_series = {**served_series, **series}
+    for view, (_, queries) in ANALYTICS_VIEWS.items():
+        entries.update(response_cache.precompute(analytics_builders(view, slugs, series), queries, version))
+    analytics = [f'{slug}/{view}' for slug in slugs for view in ANALYTICS_VIEWS]
+    response_cache.replace(version, slugs + analytics + ['__batch__'], entries)
+    return slugs
+
+def reload_data():
+    """Re-ingest the source files that changed, apply rows appended to the NAV store, and swap the affected baskets in"""
+    global DATA_VERSION, nav_data, source_fingerprints, appended_digests
+    
+    with series_lock:
+        fingerprints = {name: workbook_fingerprint(path) for name, path in SOURCE_FILES.items()}
+        changed = [name for name in SOURCE_FILES if fingerprints[name] != source_fingerprints[name]]
+        files_version, arrays, series = DATA_VERSION, nav_data, {}
+        if changed:
+            files_version = data_version(SOURCE_FILES.values())
+            
+            def load_changed_arrays():
+                arrays = ingest_workbooks({name: BASKET_WORKBOOKS[name] for name in changed if name != 'nifty'},
+                                          NAV_DTYPE)
+                if 'nifty' in changed:
+                    arrays['nifty'] = read_nifty_csv(NIFTY_DATA_FILE, NAV_DTYPE)
+                return {**nav_data, **validated(arrays, files_version)}
+            
+            # Another worker may already have published this version; then nothing is parsed
+            arrays = load_shared(f'{files_version}-{NAV_DTYPE.name}', load_changed_arrays)
+            series = {name: BasketSeries(name, arrays[name]['dates'], arrays[name].get('basket'), arrays[name]['nifty'])
+                      for name in changed}
+        
+        # Rows another worker (or the CLI) appended, also on top of re-ingested files
+        appended = {name: digest for name, digest in appended_digests.items() if name not in series}
+        extended = append_stored_rows({**served_series, **series})
+        series.update(extended)
+        appended.update({name: appended_digest(s, arrays[name]['dates']) for name, s in extended.items()})
+        version = cache_version(files_version, appended)
+        if not series:
+            return {'version': version, 'changed': []}
+        
+        slugs = swap_series(series, version)
+        nav_data, DATA_VERSION, source_fingerprints = arrays, files_version, fingerprints
+        appended_digests = appended
+        return {'version': version, 'changed': slugs}
+
+def append_navs(name, arrays):
+    """Append {'dates', 'basket', 'nifty'} rows to a served series and to the NAV store.
+    
+    Rows another worker appended to the store since this one last polled
+    are applied first, so the new rows go on top of them. The series is
+    extended rather than rebuilt (see BasketSeries.append), which checks
+    the dates before anything is written, and the store rejects NAVs that
+    are not positive; then only the payloads of the baskets built from the
+    series are recomputed.
+    """
+    global appended_digests
+    
+    with series_lock:
+        current = append_stored_rows({name: served_series[name]}).get(name, served_series[name])
+        series = current.append(arrays['dates'], arrays['basket'], arrays['nifty'])
+        file_dates = nav_data[name]['dates']
+        with closing(nav_store.connect()) as conn:
+            rows = nav_store.append_series(conn, name, arrays, after=file_dates[~np.isnat(file_dates)].max())
+        appended = {**appended_digests, name: appended_digest(series, nav_data[name]['dates'])}
+        version = cache_version(DATA_VERSION, appended)
+        slugs = swap_series({name: series}, version)
+        appended_digests = appended
+    return {'series': name, 'appended': rows, 'last': str(series.index.last), 'baskets': slugs, 'version': version}
+
+# Each worker checks the mtime and size of the source files and the NAV store
+# at most every ALPHANIFTY_RELOAD_INTERVAL seconds (0 disables) and reloads
+# when they change
+data_reloader = Reloader([*SOURCE_FILES.values(), nav_store.DB_PATH, nav_store.DB_PATH + '-wal'], reload_data,
+                         interval=float(os.environ.get('ALPHANIFTY_RELOAD_INTERVAL', '30')))
+
+# Token for the admin endpoints; they answer 404 while it is unset
+ADMIN_TOKEN = os.environ.get('ALPHANIFTY_ADMIN_TOKEN')
+
+@app.before_request
+def poll_data_files():
+    """Pick up replaced workbooks and appended rows without a restart"""
+    data_reloader.poll()
+
+def parse_window():
+    """start/end query parameters as datetime64[D] or None (raises ValueError)"""
+    start = parse_date(request.args.get('start'))
+    end = parse_date(request.args.get('end'))
+    if start is not None and end is not None and start > end:
+        raise ValueError('start must not be after end')
+    return start, end
+
+def parse_max_points():
+    """max_points query parameter, or None (raises ValueError)"""
+    max_points = request.args.get('max_points') or None
+    if max_points is not None:
+        try:
+            max_points = int(max_points)
+        except ValueError:
+            raise ValueError('max_points must be an integer')
+        if max_points < 3:
+            raise ValueError('max_points must be at least 3')
+    return max_points
+
+# Longest `years` window a request may ask for
+MAX_YEARS = 30
+
+def check_years(years):
+    """`years` if it is a window length from 1 to MAX_YEARS (raises ValueError)"""
+    if not 1 <= years <= MAX_YEARS:
+        raise ValueError(f'years must be between 1 and {MAX_YEARS}')
+    return years
+
+def parse_basket_query(years):
+    """Read start/end/resolution/max_points/risk_window query parameters into a BasketQuery (raises ValueError)"""
+    check_years(years)
+    start, end = parse_window()
+    
+    resolution = request.args.get('resolution') or None
+    if resolution is not None and resolution not in RESOLUTIONS:
+        raise ValueError(f'resolution must be one of {", ".join(RESOLUTIONS)}')
+    # 'monthly' is the default; normalise it so both spellings share a cache entry
+    if resolution == 'monthly':
+        resolution = None
+    
+    risk_window = request.args.get('risk_window') or None
+    if risk_window is not None and risk_window not in RISK_WINDOWS:
+        raise ValueError(f'risk_window must be one of {", ".join(RISK_WINDOWS)}')
+    if risk_window == DEFAULT_RISK_WINDOW:
+        risk_window = None
+    return BasketQuery(years, start, end, resolution, parse_max_points(), risk_window)
+
+def cached_json_response(cached):
+    """Serve pre-encoded JSON with a strong ETag, answering 304 when it matches.
+
+    Pre-compressed variants are chosen from Accept-Encoding, so nothing is
+    compressed per request.
+    """
+    body, encoding, etag = cached.select(request.accept_encodings)
+    # If-None-Match uses the weak comparison (RFC 9110), so W/"..." from a proxy still matches
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    # Let browsers keep the payload but revalidate it on every use
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def basket_response(basket_id):
+    """Serve a basket payload from the response cache"""
+    years = request.args.get('years', default=5, type=int)
+    try:
+        query = parse_basket_query(years)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return cached_json_response(response_cache.get(basket_id, query, BASKET_BUILDERS[basket_id]))
+
+@app.route('/api/baskets/great-india', methods=['GET'])
+def get_great_india_basket():
+    """Get Great India Basket data with absolute and rolling returns"""
+    return basket_response('great-india')
+
+@app.route('/api/baskets/conservative-balanced', methods=['GET'])
+def get_conservative_balanced_basket():
+    """Get Conservative Balanced Basket data with calculations"""
+    return basket_response('conservative-balanced')
+
+@app.route('/api/baskets/aggressive-hybrid', methods=['GET'])
+def get_aggressive_hybrid_basket():
+    """Get Aggressive Hybrid Basket data with absolute and rolling returns"""
+    return basket_response('aggressive-hybrid')
+
+@app.route('/api/baskets/white-basket', methods=['GET'])
+def get_white_basket():
+    """Get White Basket (Equity Savings) data"""
+    return basket_response('white-basket')
+
+@app.route('/api/baskets/every-common-india', methods=['GET'])
+def get_every_common_india():
+    """Get Every Common India Basket data with absolute and rolling returns"""
+    return basket_response('every-common-india')
+
+@app.route('/api/baskets/raising-india', methods=['GET'])
+def get_raising_india():
+    """Get Raising India Basket data with absolute and rolling returns"""
+    return basket_response('raising-india')
+
+@app.route('/api/baskets/conservative', methods=['GET'])
+def get_conservative_basket():
+    """Get Conservative Basket data with absolute and rolling returns"""
+    return basket_response('conservative')
+
+@app.route('/api/baskets/dusshera', methods=['GET'])
+def get_dusshera_basket():
+    """Get Dusshera Basket data with absolute and rolling returns"""
+    return basket_response('dusshera')
+
+@app.route('/api/baskets/yellow', methods=['GET'])
+def get_yellow_basket():
+    """Get Yellow Basket data with absolute and rolling returns"""
+    return basket_response('yellow')
+
+def analytics_series(basket_id):
+    """Name of the daily NAV series behind a basket, or an error response"""
+    name = BASKET_SERIES.get(basket_id)
+    if name is None:
+        return None, (jsonify({'error': 'Unknown basket', 'id': basket_id}), 404)
+    if served_series[name].basket is None:
+        return None, (jsonify({'error': 'This basket has no daily NAV series', 'id': basket_id}), 404)
+    return name, None
+
+@app.route('/api/baskets/<basket_id>/drawdown', methods=['GET'])
+def get_basket_drawdown(basket_id):
+    """Drawdown curve, deepest drawdown episodes and time under water of a basket and NIFTY.
+    
+    start/end (YYYY-MM-DD) limit the range (default: all history), top is
+    the number of episodes (default 5, at most 20) and max_points thins the
+    curve with LTTB. Cached per data version and query.
+    """
+    name, error = analytics_series(basket_id)
+    if error:
+        return error
+    try:
+        start, end = parse_window()
+        top = request.args.get('top', default=DEFAULT_EPISODES, type=int)
+        if not 1 <= top <= MAX_EPISODES:
+            raise ValueError(f'top must be between 1 and {MAX_EPISODES}')
+        query = DrawdownQuery(start, end, top, parse_max_points())
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return cached_json_response(response_cache.get(f'{basket_id}/drawdown', query, partial(build_drawdown, name)))
+
+@app.route('/api/baskets/<basket_id>/rolling-stats', methods=['GET'])
+def get_basket_rolling_stats(basket_id):
+    """Distribution of a basket's rolling 1/3/5/7/10Y CAGRs against NIFTY's.
+    
+    For every window length: min, max, mean, median and percentiles of the
+    CAGRs of all windows in the history, the share of positive windows and
+    of windows that beat NIFTY, and the worst and best windows' dates.
+    Precomputed per data version.
+    """
+    name, error = analytics_series(basket_id)
+    if error:
+        return error
+    return cached_json_response(response_cache.get(f'{basket_id}/rolling-stats', (), partial(build_rolling_stats, name)))
+
+def parse_batch_ids(ids_param, default_query):
+    """Parse 'slug[:years],...' into a tuple of (slug, BasketQuery) pairs"""
+    requested = []
+    for token in filter(None, (t.strip() for t in ids_param.split(','))):
+        slug, _, years = token.partition(':')
+        query = default_query._replace(years=check_years(int(years))) if years else default_query
+        requested.append((slug, query))
+    return tuple(requested)
+
+def build_basket_batch(requested, fields):
+    """Build the combined payload for a batch of baskets"""
+    baskets = []
+    for slug, query in requested:
+        payload = response_cache.get(slug, query, BASKET_BUILDERS[slug]).payload
+        if fields:
+            payload = {key: payload[key] for key in fields if key in payload}
+        baskets.append({'slug': slug, 'years': query.years, 'data': payload})
+    return {'baskets': baskets}
+
+@app.route('/api/baskets', methods=['GET'])
+def get_baskets_batch():
+    """Get several baskets in one response.
+
+    ids=great-india,white-basket:3 picks baskets (optionally with their own
+    years, default all baskets); fields=id,name,metrics keeps only those
+    top-level keys, e.g. to leave out graphData. start/end apply to all.
+    """
+    years = request.args.get('years', default=5, type=int)
+    try:
+        query = parse_basket_query(years)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        requested = parse_batch_ids(request.args.get('ids', ','.join(BASKET_BUILDERS)), query)
+    except ValueError:
+        return jsonify({'error': f'ids must look like slug or slug:years, with years from 1 to {MAX_YEARS}'}), 400
+
+    unknown = [slug for slug, _ in requested if slug not in BASKET_BUILDERS]
+    if unknown:
+        return jsonify({'error': 'Unknown baskets', 'ids': unknown}), 404
+
+    fields = tuple(filter(None, (f.strip() for f in request.args.get('fields', '').split(','))))
+    return cached_json_response(response_cache.get('__batch__', (requested, fields), build_basket_batch))
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Response cache hit/miss counters"""
+    return jsonify(response_cache.stats())
+
+@app.route('/api/data-quality', methods=['GET'])
+def data_quality():
+    """What the ingest repairs changed in each series (see nav_quality.py)"""
+    report = nav_quality.read_report()
+    if report is None:
+        return jsonify({'error': 'No data-quality report has been written yet'}), 404
+    return jsonify(report)
+
+def nullable(values):
+    """Float array as a JSON-ready list with NaN as null"""
+    return [None if v != v else v for v in values.tolist()]
+
+@app.route('/api/navs', methods=['GET'])
+def list_stored_navs():
+    """Baskets in the SQLite NAV store with their row counts and date ranges"""
+    conn = open_nav_store()
+    if conn is None:
+        return jsonify({'baskets': []})
+    with closing(conn):
+        return jsonify({'baskets': nav_store.list_baskets(conn)})
+
+@app.route('/api/navs/<basket_id>', methods=['GET'])
+def get_stored_navs(basket_id):
+    """Daily NAVs of any basket imported into the NAV store (see nav_store.py).
+    
+    start/end (YYYY-MM-DD) select a range through the (basket_id, date) index.
+    """
+    try:
+        start = parse_date(request.args.get('start'))
+        end = parse_date(request.args.get('end'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    conn = open_nav_store()
+    series = None
+    if conn is not None:
+        with closing(conn):
+            series = nav_store.read_series(conn, basket_id, start, end)
+    if series is None:
+        return jsonify({'error': 'Unknown basket', 'id': basket_id}), 404
+    return jsonify({
+        'basketId': basket_id,
+        'dates': np.datetime_as_string(series['dates'], unit='D').tolist(),
+        'basketNav': nullable(series['basket']),
+        'niftyNav': nullable(series['nifty']),
+    })
+
+def check_admin_token():
+    """Error response unless the request carries `Authorization: Bearer <ALPHANIFTY_ADMIN_TOKEN>`"""
+    if not ADMIN_TOKEN:
+        return jsonify({'error': 'Not found'}), 404
+    supplied = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(supplied.encode(), f'Bearer {ADMIN_TOKEN}'.encode()):
+        return jsonify({'error': 'Unauthorized'}), 401
+    return None
+
+def parse_nav_rows(rows, with_basket):
+    """{'dates', 'basket', 'nifty'} arrays from [{date, basketNav, niftyNav}] JSON rows (raises ValueError)"""
+    if not isinstance(rows, list) or not rows:
+        raise ValueError('rows must be a non-empty list of {date, basketNav, niftyNav}')
+    try:
+        dates = np.array([parse_date(row['date']) for row in rows], dtype='datetime64[D]')
+        nifty = np.array([row['niftyNav'] for row in rows], dtype=np.float64)
+        basket = np.array([row['basketNav'] for row in rows], dtype=np.float64) if with_basket else None
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"every row needs date, niftyNav{' and basketNav' if with_basket else ''} ({e})")
+    return {'dates': dates, 'basket': basket, 'nifty': nifty}
+
+@app.route('/api/admin/reload', methods=['GET', 'POST'])
+def admin_reload():
+    """Reload changed basket data (POST, ?wait=1 to block until done) or report the last reload (GET).
+    
+    Requires `Authorization: Bearer <ALPHANIFTY_ADMIN_TOKEN>`. Only the
+    worker that receives the request reloads now; the others follow on
+    their next poll.
+    """
+    denied = check_admin_token()
+    if denied:
+        return denied
+    
+    if request.method == 'GET':
+        return jsonify(data_reloader.status())
+    if request.args.get('wait') in ('1', 'true'):
+        result = data_reloader.run()
+        return jsonify(result), 200 if result['ok'] else 500
+    started = data_reloader.start()
+    return jsonify({'started': started, **data_reloader.status()}), 202
+
+@app.route('/api/admin/navs/<name>', methods=['POST'])
+def admin_append_navs(name):
+    """Append daily rows to a series, e.g. {"rows": [{"date": "2025-11-11", "basketNav": 812.4, "niftyNav": 26120.5}]}.
+    
+    `name` is a series name (great_india, nifty, ...); the rows must be dated
+    after its last date and are kept in the NAV store, so they survive
+    restarts and reach the other workers on their next poll. basketNav is
+    ignored for nifty. Requires the admin token.
+    """
+    denied = check_admin_token()
+    if denied:
+        return denied
+    if name not in SOURCE_FILES:
+        return jsonify({'error': 'Unknown series', 'name': name, 'series': list(SOURCE_FILES)}), 404
+    
+    try:
+        body = request.get_json(silent=True)
+        rows = body.get('rows') if isinstance(body, dict) else None
+        arrays = parse_nav_rows(rows, with_basket=name != 'nifty')
+        return jsonify(append_navs(name, arrays))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except sqlite3.Error as e:
+        return jsonify({'error': f'NAV store: {e}'}), 500
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -0,0 +1,188 @@
+"""Compact in-memory form of a basket: contiguous NumPy arrays instead of a DataFrame."""
+import numpy as np
+
+from date_index import LookbackIndex
+from downsample import period_starts
+from relative_metrics import horizon_relative
+from risk_metrics import horizon_metrics
+from rolling_risk import return_sums
+from rolling_returns import format_month_labels
+
+# Default `row` of the per-row tables: the last row (None means there is no row)
+LATEST = object()
+
+# Month label formats used by the payloads; every series keeps a label table for each
+MONTH_LABEL_FORMATS = ('%b %y', '%b %Y', '%Y-%m')
+
+
+class BasketSeries:
+    """Dates and NAVs of one basket (or of NIFTY alone) plus arrays derived at load time.
+
+    `dates` is sorted datetime64[D] with any NaT last; `basket` and `nifty`
+    are float64, or float32 when the arrays were stored that way. Nothing
+    here is ever written to, so the arrays may be read-only views of the
+    shared memory maps and are handed to the generators without copying.
+    """
+
+    __slots__ = ('name', 'dates', 'basket', 'nifty', 'index', 'month_starts', 'row_months', 'month_labels',
+                 'basket_peak', 'nifty_peak', '_risk', '_relative', '_return_sums')
+
+    def __init__(self, name, dates, basket, nifty):
+        self.name = name
+        self.dates = np.asarray(dates).astype('datetime64[D]', copy=False)
+        self.basket = None if basket is None else np.asarray(basket)
+        self.nifty = np.asarray(nifty)
+        self.index = LookbackIndex(self.dates)
+        # First row of every calendar month, for monthly charts
+        self.month_starts = period_starts(self.dates[:self.index.valid], 'monthly').astype(np.int32)
+        # Month of every row (an index into month_starts) and each month's label in
+        # every format, so monthly labels are a take() rather than date formatting
+        is_start = np.zeros(self.index.valid, dtype=np.int32)
+        is_start[self.month_starts] = 1
+        self.row_months = np.cumsum(is_start, dtype=np.int32) - 1
+        self.month_labels = {
+            label_format: np.array(format_month_labels(self.dates[self.month_starts], label_format), dtype=str)
+            for label_format in MONTH_LABEL_FORMATS
+        }
+        # Running maxima (missing NAVs skipped), the peaks drawdowns are measured from
+        self.basket_peak = None if self.basket is None else np.fmax.accumulate(self.basket)
+        self.nifty_peak = np.fmax.accumulate(self.nifty)
+        self._risk = None
+        self._relative = None
+        self._return_sums = None
+
+    def __len__(self):
+        return len(self.dates)
+
+    def bucket_starts(self, lo, hi, resolution='monthly'):
+        """Bucket start positions of rows lo..hi-1, relative to lo.
+
+        Monthly buckets come from the precomputed month starts; the first
+        bucket always starts at lo even mid-month, like resample().first().
+        """
+        if resolution != 'monthly':
+            return period_starts(self.dates[lo:hi], resolution)
+        inner = self.month_starts[np.searchsorted(self.month_starts, lo, side='right'):
+                                  np.searchsorted(self.month_starts, hi, side='left')]
+        return np.r_[0, inner - lo]
+
+    def labels_at(self, rows, label_format):
+        """Month labels of the given rows as a list, from the label table when there is one"""
+        labels = self.month_labels.get(label_format)
+        if labels is None:
+            return format_month_labels(self.dates[rows], label_format)
+        return labels[self.row_months[rows]].tolist()
+
+    def risk_metrics(self, row=LATEST):
+        """{horizon: metrics} of the basket NAVs (NIFTY for a benchmark) ending at `row`, see risk_metrics.py.
+
+        `row` defaults to the last row; None (a window ending before the
+        first date) gives a table of None. The table for the last row is
+        computed once per series, i.e. once per data version (the payloads
+        are warmed at load time); other rows are computed on demand.
+        """
+        last = self.index.valid - 1
+        navs = self.nifty if self.basket is None else self.basket
+        if row is not LATEST and row != last:
+            return horizon_metrics(self.dates, navs, self.index, row)
+        if self._risk is None:
+            self._risk = horizon_metrics(self.dates, navs, self.index, last if last >= 0 else None)
+        return self._risk
+
+    def relative_metrics(self, row=LATEST):
+        """{horizon: metrics} of the basket relative to NIFTY ending at `row`, see relative_metrics.py.
+
+        None for a benchmark. `row` works as in risk_metrics(): the last
+        row by default, whose table is computed once per series, and None
+        for a table of None.
+        """
+        if self.basket is None:
+            return None
+        last = self.index.valid - 1
+        if row is not LATEST and row != last:
+            return horizon_relative(self.dates, self.basket, self.nifty, self.month_starts, self.index, row)
+        if self._relative is None:
+            self._relative = horizon_relative(self.dates, self.basket, self.nifty, self.month_starts, self.index,
+                                              last if last >= 0 else None)
+        return self._relative
+
+    def return_sums(self):
+        """Prefix sums of the daily basket and NIFTY returns behind the rolling risk charts, see rolling_risk.py.
+
+        Built on first use, once per series; None for a benchmark.
+        """
+        if self.basket is None:
+            return None
+        if self._return_sums is None:
+            valid = self.index.valid
+            self._return_sums = return_sums(self.basket[:valid], self.nifty[:valid])
+        return self._return_sums
+
+    def append(self, dates, basket, nifty):
+        """A new series with rows added after the last date.
+
+        The derived arrays are extended from their last value instead of
+        being rebuilt: lookback positions, month starts and labels and
+        running peaks cost O(new rows x lookback periods); the NAV arrays
+        themselves are copied once. Rows with a NaT date are dropped. This
+        series is left unchanged, so requests still using it are unaffected.
+        Raises ValueError unless the dates are increasing and after the
+        current last date and every NAV is positive and finite, the
+        guarantee the ingest repairs give (see nav_quality.py).
+        """
+        dates = np.asarray(dates).astype('datetime64[D]')
+        valid = self.index.valid
+        if (basket is None) != (self.basket is None):
+            raise ValueError('basket NAVs are required for a basket and not allowed for a benchmark')
+        if np.isnat(dates).any() or (np.diff(dates) <= np.timedelta64(0, 'D')).any():
+            raise ValueError('dates must be valid and strictly increasing')
+        if len(dates) and valid and dates[0] <= self.dates[valid - 1]:
+            raise ValueError(f'dates must be after the last stored date {self.dates[valid - 1]}')
+        for values in (basket, nifty):
+            if values is not None and not (np.isfinite(values) & (np.asarray(values) > 0)).all():
+                raise ValueError('NAVs must be positive numbers')
+        if len(dates) == 0:
+            return self
+        if valid == 0:
+            return BasketSeries(self.name, dates, basket, nifty)
+        
+        def extend(values, new):
+            return np.concatenate([values[:valid], np.asarray(new, dtype=values.dtype)])
+        
+        series = BasketSeries.__new__(BasketSeries)
+        series.name = self.name
+        series.dates = extend(self.dates, dates)
+        series.basket = None if basket is None else extend(self.basket, basket)
+        series.nifty = extend(self.nifty, nifty)
+        series.index = self.index.extended(series.dates)
+        # A new row starts a month when its month differs from the row before
+        months = series.dates[valid - 1:].astype('datetime64[M]')
+        new_starts = valid + np.flatnonzero(months[1:] != months[:-1])
+        series.month_starts = np.concatenate([self.month_starts, new_starts.astype(np.int32)])
+        series.row_months = np.concatenate([
+            self.row_months[:valid],
+            self.row_months[valid - 1] + np.cumsum(months[1:] != months[:-1], dtype=np.int32),
+        ])
+        series.month_labels = {
+            label_format: np.concatenate([labels, format_month_labels(series.dates[new_starts], label_format)])
+            for label_format, labels in self.month_labels.items()
+        }
+        new = slice(valid, None)
+        if series.basket is None:
+            series.basket_peak = None
+        else:
+            series.basket_peak = extend(self.basket_peak, np.fmax.accumulate(
+                np.r_[self.basket_peak[valid - 1], series.basket[new]])[1:])
+        series.nifty_peak = extend(self.nifty_peak, np.fmax.accumulate(
+            np.r_[self.nifty_peak[valid - 1], series.nifty[new]])[1:])
+        # Trailing windows all move, so the risk table is recomputed on first use; the
+        # return sums are centred on the mean of all returns, so they are rebuilt too
+        series._risk = series._relative = None
+        series._return_sums = None
+        return series
+
+    def nbytes(self):
+        """Bytes held by the series' own arrays (views of shared maps included)"""
+        arrays = [self.dates, self.basket, self.nifty, self.month_starts, self.row_months, self.basket_peak,
+                  self.nifty_peak, *self.month_labels.values()]
+        return sum(a.nbytes for a in arrays if a is not None) + self.index.positions_nbytes()
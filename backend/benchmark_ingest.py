@@ -0,0 +1,66 @@
+"""Time a full reload of the basket workbooks, in-process vs the process pool.
+
+Every run parses all workbooks from scratch (into an empty workbook cache)
+through ingest.ingest_workbooks, and also checks that the pool returns the
+same arrays. The slowest single workbook is the floor the pool can reach.
+
+Run from the backend directory:
+
+    python benchmark_ingest.py [workers]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+os.environ['ALPHANIFTY_CACHE_DIR'] = tempfile.mkdtemp(prefix='alphanifty-ingest-')
+
+import ingest  # noqa: E402
+import workbook_cache  # noqa: E402
+
+WORKERS = int(sys.argv[1]) if len(sys.argv) > 1 else max(os.cpu_count() or 1, 2)
+
+
+def clear_cache():
+    for entry in os.listdir(workbook_cache.CACHE_DIR):
+        os.remove(os.path.join(workbook_cache.CACHE_DIR, entry))
+
+
+def timed(fn, *args):
+    clear_cache()
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    import app  # builds the caches once; BASKET_WORKBOOKS describes every workbook
+
+    workbooks = app.BASKET_WORKBOOKS
+    # Warm pandas/openpyxl imports so neither timing pays for them
+    ingest.ingest_workbooks(workbooks, workers=1)
+
+    print(f'{"workbook":<22}{"parse":>10}')
+    slowest = 0
+    for name, spec in workbooks.items():
+        _, seconds = timed(ingest.ingest_workbook, *spec)
+        slowest = max(slowest, seconds)
+        print(f'{name:<22}{seconds * 1000:>8.0f} ms')
+
+    serial, serial_s = timed(ingest.ingest_workbooks, workbooks, 'float64', 1)
+    pooled, pooled_s = timed(ingest.ingest_workbooks, workbooks, 'float64', WORKERS)
+    for name in workbooks:
+        for key in serial[name]:
+            assert np.array_equal(serial[name][key], pooled[name][key], equal_nan=True), (name, key)
+
+    print()
+    print(f'{"full reload, in-process":<28}{serial_s * 1000:>8.0f} ms')
+    print(f'{f"full reload, {WORKERS} workers":<28}{pooled_s * 1000:>8.0f} ms  ({os.cpu_count()} CPUs)')
+    print(f'{"slowest single workbook":<28}{slowest * 1000:>8.0f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
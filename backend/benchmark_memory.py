@@ -0,0 +1,130 @@
+"""Compare per-worker memory across the ways workers can be started.
+
+- heap:    N processes each import app with per-process NAV frames
+           (N gunicorn workers without --preload, ALPHANIFTY_SHARED_ARRAYS=0)
+- shared:  the same, mapping the shared .npy NAV arrays (nav_arrays.py)
+- fork:    one process imports app and forks N workers (gunicorn --preload)
+- freeze:  as fork, with gc.freeze() before forking (gunicorn.conf.py)
+
+Forked workers serve every basket once and run a full collection, as a
+worker would soon after start, before being measured. Figures come from
+/proc/<pid>/smaps_rollup, so this runs on Linux only.
+
+Run from the backend directory:
+
+    python benchmark_memory.py [workers]
+"""
+import gc
+import os
+import subprocess
+import sys
+
+import nav_arrays
+from process_memory import memory_usage
+
+WORKERS = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+
+# Imports app, reports readiness and stays alive until stdin closes
+WORKER_CODE = 'import app, sys; print("ready", flush=True); sys.stdin.read()'
+
+
+def array_mappings(pid):
+    """Resident KiB of the process's mappings of the shared .npy files"""
+    resident = 0
+    in_array_file = False
+    with open(f'/proc/{pid}/smaps') as f:
+        for line in f:
+            first = line.split(' ', 1)[0]
+            if '-' in first and not first.endswith(':'):
+                in_array_file = nav_arrays.ARRAY_DIR in line
+            elif in_array_file and first == 'Rss:':
+                resident += int(line.split()[1])
+    return resident
+
+
+def spawn_workers(shared):
+    """Start WORKERS interpreters that each import app; returns their pids and a cleanup"""
+    env = dict(os.environ, ALPHANIFTY_SHARED_ARRAYS='1' if shared else '0')
+    procs = [
+        subprocess.Popen([sys.executable, '-c', WORKER_CODE], env=env,
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        for _ in range(WORKERS)
+    ]
+    for proc in procs:
+        proc.stdout.readline()
+
+    def stop():
+        for proc in procs:
+            proc.stdin.close()
+            proc.wait()
+    return [proc.pid for proc in procs], stop
+
+
+def fork_workers(freeze):
+    """Fork WORKERS children from this (preloaded) process; returns their pids and a cleanup"""
+    import app
+
+    if freeze:
+        gc.freeze()
+    pids = []
+    release_r, release_w = os.pipe()
+    for _ in range(WORKERS):
+        ready_r, ready_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(release_w)
+            client = app.app.test_client()
+            for slug in app.BASKET_BUILDERS:
+                client.get(f'/api/baskets/{slug}')
+            gc.collect()
+            os.write(ready_w, b'1')
+            os.read(release_r, 1)
+            os._exit(0)
+        os.close(ready_w)
+        os.read(ready_r, 1)
+        os.close(ready_r)
+        pids.append(pid)
+
+    def stop():
+        os.close(release_w)
+        for pid in pids:
+            os.waitpid(pid, 0)
+        os.close(release_r)
+        if freeze:
+            gc.unfreeze()
+    return pids, stop
+
+
+def report(mode, pids):
+    stats = [memory_usage(pid) for pid in pids]
+    mapped = [array_mappings(pid) for pid in pids]
+    rss = sum(s['rss'] for s in stats) / len(pids) / 1024
+    pss = sum(s['pss'] for s in stats) / len(pids) / 1024
+    private = sum(s['private'] for s in stats) / len(pids) / 1024
+    total = sum(s['pss'] for s in stats) / 1024
+    npy = sum(mapped) / len(pids) / 1024
+    print(f'{mode:<10}{rss:>11.1f} MB{pss:>11.1f} MB{private:>13.1f} MB{total:>9.1f} MB{npy:>9.2f} MB')
+
+
+def main():
+    # Publish the arrays once so every shared worker maps instead of building
+    subprocess.run([sys.executable, '-c', 'import app'], stderr=subprocess.DEVNULL, check=True)
+
+    print(f'{WORKERS} workers')
+    print(f"{'mode':<10}{'RSS/worker':>14}{'PSS/worker':>14}{'private/worker':>16}{'PSS total':>12}{'npy mapped':>12}")
+    for mode, start in (
+        ('heap', lambda: spawn_workers(shared=False)),
+        ('shared', lambda: spawn_workers(shared=True)),
+        ('fork', lambda: fork_workers(freeze=False)),
+        ('freeze', lambda: fork_workers(freeze=True)),
+    ):
+        pids, stop = start()
+        try:
+            report(mode, pids)
+        finally:
+            stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
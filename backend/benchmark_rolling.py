@@ -0,0 +1,93 @@
+"""Benchmark the vectorized rolling-CAGR engine against the old per-row loops.
+
+Run from the backend directory:
+
+    python benchmark_rolling.py
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+import app
+from date_index import DateIndex
+from rolling_returns import rolling_cagr
+
+YEARS = [1, 3, 5, 10]
+LOOP_REPEAT = 1
+NUMPY_REPEAT = 5
+
+BASKETS = [
+    ('great-india', app.served_series['great_india'], False),
+    ('aggressive-hybrid', app.served_series['aggressive_basket'], False),
+    ('every-common-india', app.served_series['every_common'], True),
+    ('raising-india', app.served_series['raising_india'], True),
+    ('conservative', app.served_series['conservative_basket'], False),
+    ('dusshera', app.served_series['dusshera_basket'], False),
+    ('yellow', app.served_series['yellow_basket'], False),
+]
+
+
+def loop_rolling_cagr(df_full, basket_col, nifty_col, window, years, cutoff_date, require_positive):
+    """The per-row iloc loop the generate_*_graph_data functions used before"""
+    rolling_labels = []
+    rolling_basket = []
+    rolling_nifty = []
+    for i in range(window, len(df_full)):
+        current_date = df_full.iloc[i]['DATE']
+        basket_current = df_full.iloc[i][basket_col]
+        basket_past = df_full.iloc[i - window][basket_col]
+        nifty_current = df_full.iloc[i][nifty_col]
+        nifty_past = df_full.iloc[i - window][nifty_col]
+        if require_positive and not (basket_past > 0 and nifty_past > 0):
+            continue
+        basket_cagr = ((basket_current / basket_past) ** (1 / years) - 1) * 100
+        nifty_cagr = ((nifty_current / nifty_past) ** (1 / years) - 1) * 100
+        if current_date >= cutoff_date:
+            rolling_labels.append(current_date.strftime('%b %Y'))
+            rolling_basket.append(round(basket_cagr, 2))
+            rolling_nifty.append(round(nifty_cagr, 2))
+    return rolling_labels, rolling_basket, rolling_nifty
+
+
+def best_time(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def same(a, b):
+    """Element-wise equality that treats NaN == NaN"""
+    return len(a) == len(b) and all(x == y or (x != x and y != y) for x, y in zip(a, b))
+
+
+def main():
+    print(f"{'basket':<20}{'years':>6}{'rows':>8}{'loop ms':>12}{'numpy ms':>12}{'speedup':>10}  match")
+    for name, series, require_positive in BASKETS:
+        # The old loop ran on DataFrames
+        basket_col, nifty_col = 'Basket_NAV', 'NIFTY_50'
+        df = pd.DataFrame({'DATE': series.dates.astype('datetime64[ns]'), basket_col: series.basket,
+                           nifty_col: series.nifty})
+        dates = df['DATE'].to_numpy()
+        basket = series.basket
+        nifty = series.nifty
+        date_index = DateIndex(dates)
+        for years in YEARS:
+            window = years * 12
+            cutoff_date = df['DATE'].max() - pd.DateOffset(years=years)
+            start, stop = date_index.window(np.datetime64(cutoff_date))
+            loop_s, expected = best_time(lambda: loop_rolling_cagr(
+                df, basket_col, nifty_col, window, years, cutoff_date, require_positive), LOOP_REPEAT)
+            numpy_s, actual = best_time(lambda: rolling_cagr(
+                dates, basket, nifty, window, years, start=start, stop=stop,
+                require_positive=require_positive), NUMPY_REPEAT)
+            match = all(same(e, a) for e, a in zip(expected, actual))
+            print(f'{name:<20}{years:>6}{len(df):>8}{loop_s * 1000:>12.1f}{numpy_s * 1000:>12.2f}'
+                  f'{loop_s / numpy_s:>9.0f}x  {"✓" if match else "✗"}')
+
+
+if __name__ == '__main__':
+    main()
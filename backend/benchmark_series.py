@@ -0,0 +1,88 @@
+"""Measure the memory of each basket as a BasketSeries against the DataFrame layout it replaced.
+
+For every basket this reports the heap allocated to build the old layout
+(a sorted DataFrame plus its LookbackIndex) and the BasketSeries, in
+float64 and float32 and on top of the shared memory maps (where only the
+derived arrays are private to a worker), and the memory allocated while
+building one uncached response. Figures come from tracemalloc.
+
+Run from the backend directory:
+
+    python benchmark_series.py
+"""
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import app
+from basket_series import BasketSeries
+from date_index import LookbackIndex
+
+BASKETS = [
+    ('great-india', app.served_series['great_india']),
+    ('conservative-balanced', None),
+    ('aggressive-hybrid', app.served_series['aggressive_basket']),
+    ('white-basket', app.served_series['white_basket']),
+    ('every-common-india', app.served_series['every_common']),
+    ('raising-india', app.served_series['raising_india']),
+    ('conservative', app.served_series['conservative_basket']),
+    ('dusshera', app.served_series['dusshera_basket']),
+    ('yellow', app.served_series['yellow_basket']),
+]
+
+
+def allocated(fn):
+    """(result, bytes still allocated by fn, peak bytes allocated while it ran)"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    result = fn()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, after - before, peak - before
+
+
+def dataframe_layout(series):
+    """The old per-basket layout: a DataFrame sorted by date (so a shuffled index) and its LookbackIndex"""
+    order = np.random.default_rng(0).permutation(len(series))
+    df = pd.DataFrame({
+        'DATE': series.dates.astype('datetime64[ns]')[order],
+        'Basket_NAV': np.array(series.basket, dtype=np.float64)[order],
+        'NIFTY_50': np.array(series.nifty, dtype=np.float64)[order],
+    }).sort_values('DATE')
+    return df, LookbackIndex(df['DATE'])
+
+
+def series_layout(series, dtype):
+    return BasketSeries(series.name, np.array(series.dates), np.array(series.basket, dtype=dtype),
+                        np.array(series.nifty, dtype=dtype))
+
+
+def mapped_layout(name):
+    arrays = app.nav_data[name]
+    return BasketSeries(name, arrays['dates'], arrays['basket'], arrays['nifty'])
+
+
+def main():
+    print(f"{'basket':<24}{'rows':>7}{'DataFrame':>12}{'series f64':>12}{'series f32':>12}{'mapped':>12}"
+          f"{'per request':>13}")
+    for name, series in BASKETS:
+        builder = app.BASKET_BUILDERS[name]
+        builder()  # first call sets up anything lazily initialised
+        _, _, request_peak = allocated(builder)
+        if series is None:
+            print(f"{name:<24}{'-':>7}{'-':>12}{'-':>12}{'-':>12}{'-':>12}{request_peak / 1024:>9.0f} KiB")
+            continue
+
+        # Keep the results alive until measured so nothing is freed early
+        _, frame_bytes, _ = allocated(lambda: dataframe_layout(series))
+        _, f64_bytes, _ = allocated(lambda: series_layout(series, np.float64))
+        _, f32_bytes, _ = allocated(lambda: series_layout(series, np.float32))
+        _, mapped_bytes, _ = allocated(lambda: mapped_layout(series.name))
+        print(f'{name:<24}{len(series):>7}{frame_bytes / 1024:>8.0f} KiB{f64_bytes / 1024:>8.0f} KiB'
+              f'{f32_bytes / 1024:>8.0f} KiB{mapped_bytes / 1024:>8.0f} KiB{request_peak / 1024:>9.0f} KiB')
+
+
+if __name__ == '__main__':
+    main()
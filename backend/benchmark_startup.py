@@ -0,0 +1,172 @@
+"""Cold-start benchmark: import cost of app.py and time until it answers HTTP.
+
+Each run starts a fresh interpreter. Reported per run:
+- `import app` time and the slowest imports, from `python -X importtime`
+- whether pandas/openpyxl were imported (they should not be once the caches exist)
+- time from process start to the first 200 from /api/health, and to the first
+  basket response
+
+By default the workbook and array caches are built first, so this measures
+the serving path; --no-cache points both at an empty directory to measure
+ingestion as well. With --json the results are printed as one JSON object,
+and --max-first-response makes the exit status non-zero when the median
+time to first response exceeds that many seconds, so CI can track it:
+
+    python benchmark_startup.py --runs 5 --json --max-first-response 3
+"""
+import argparse
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Serves app.py with the stdlib-based werkzeug server, so no gunicorn is needed
+SERVER_CODE = '''
+import sys
+import app
+from werkzeug.serving import make_server
+make_server("127.0.0.1", int(sys.argv[1]), app.app).serve_forever()
+'''
+
+HEAVY_MODULES = ('pandas', 'openpyxl')
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def import_profile(env):
+    """(import app seconds, [(module app imports, seconds)] slowest first, heavy modules imported)"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True)
+    modules = []
+    children = []
+    app_seconds = None
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nesting is shown by two extra spaces of indentation per level; a
+        # module's own imports are listed just before it
+        name = name[1:].rstrip()
+        seconds = int(cumulative) / 1e6
+        modules.append(name.strip())
+        if not name.startswith(' '):
+            if name == 'app':
+                app_seconds = seconds
+                break
+            children = []
+        elif not name.startswith('   '):
+            children.append((name.strip(), seconds))
+    slowest = sorted(children, key=lambda item: -item[1])[:8]
+    heavy = sorted({name.split('.')[0] for name in modules} & set(HEAVY_MODULES))
+    return app_seconds, slowest, heavy
+
+
+def wait_for(url, deadline):
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                response.read()
+                return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.005)
+    return False
+
+
+def first_response(env, timeout=60):
+    """Seconds from spawning the server to its first /api/health and basket responses"""
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen([sys.executable, '-c', SERVER_CODE, str(port)], cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base = f'http://127.0.0.1:{port}'
+        if not wait_for(f'{base}/api/health', started + timeout):
+            raise RuntimeError('server did not answer /api/health')
+        health = time.perf_counter() - started
+        wait_for(f'{base}/api/baskets/great-india', started + timeout)
+        basket = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+    return health, basket
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure cold start of the backend')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--no-cache', action='store_true', help='start from empty workbook/array caches')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('--max-first-response', type=float, default=None,
+                        help='fail if the median time to first /api/health response exceeds this (s)')
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    scratch = None
+    if args.no_cache:
+        scratch = tempfile.mkdtemp(prefix='alphanifty-startup-')
+    else:
+        # Build the caches once so every run measures the serving path
+        subprocess.run([sys.executable, '-c', 'import app'], cwd=BACKEND_DIR, env=env,
+                       stderr=subprocess.DEVNULL, check=True)
+
+    runs = []
+    try:
+        for i in range(args.runs):
+            if scratch is not None:
+                shutil.rmtree(scratch, ignore_errors=True)
+                env['ALPHANIFTY_CACHE_DIR'] = os.path.join(scratch, 'workbooks')
+                env['ALPHANIFTY_ARRAY_DIR'] = os.path.join(scratch, 'arrays')
+            app_seconds, slowest, heavy = import_profile(env)
+            if scratch is not None:
+                shutil.rmtree(scratch, ignore_errors=True)
+            health, basket = first_response(env)
+            runs.append({'import': app_seconds, 'health': health, 'basket': basket,
+                         'heavy_imports': heavy, 'slowest_imports': slowest})
+    finally:
+        if scratch is not None:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    summary = {
+        'mode': 'no-cache' if args.no_cache else 'cached',
+        'runs': args.runs,
+        'import_app_s': statistics.median(r['import'] for r in runs),
+        'first_health_s': statistics.median(r['health'] for r in runs),
+        'first_basket_s': statistics.median(r['basket'] for r in runs),
+        'heavy_imports': runs[-1]['heavy_imports'],
+        'slowest_imports': [[name, round(s, 4)] for name, s in runs[-1]['slowest_imports']],
+    }
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"mode: {summary['mode']}, median of {args.runs} runs")
+        print(f"  import app          {summary['import_app_s'] * 1000:8.0f} ms")
+        print(f"  first /api/health   {summary['first_health_s'] * 1000:8.0f} ms")
+        print(f"  first basket        {summary['first_basket_s'] * 1000:8.0f} ms")
+        print(f"  pandas/openpyxl     {', '.join(summary['heavy_imports']) or 'not imported'}")
+        print('  slowest imports:')
+        for name, seconds in summary['slowest_imports']:
+            print(f'    {name:<28}{seconds * 1000:8.1f} ms')
+
+    if args.max_first_response is not None and summary['first_health_s'] > args.max_first_response:
+        print(f"first response took {summary['first_health_s']:.2f}s, over the "
+              f'{args.max_first_response:.2f}s budget', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Sorted datetime64 index for O(log n) date-range slicing of basket data."""
+import numpy as np
+
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD query parameter into datetime64[D] (None passes through)"""
+    if value is None or value == '':
+        return None
+    try:
+        return np.datetime64(value, 'D')
+    except ValueError:
+        raise ValueError(f'Invalid date {value!r}, expected YYYY-MM-DD')
+
+
+class DateIndex:
+    """Row positions of a date column sorted ascending (NaT, if any, last).
+
+    Dates keep their datetime64 unit (the basket series use datetime64[D]).
+    """
+
+    __slots__ = ('dates', 'valid')
+
+    def __init__(self, dates):
+        self.dates = np.asarray(dates)
+        if self.dates.dtype.kind != 'M':
+            self.dates = self.dates.astype('datetime64[ns]')
+        # sort_values() puts NaT at the end; keep it out of every window
+        self.valid = len(self.dates) - int(np.isnat(self.dates).sum())
+
+    @property
+    def first(self):
+        return self.dates[0]
+
+    @property
+    def last(self):
+        return self.dates[self.valid - 1]
+
+    def window(self, start=None, end=None):
+        """Return (lo, hi) so that rows lo..hi-1 fall within [start, end]"""
+        valid = self.dates[:self.valid]
+        lo = 0 if start is None else int(np.searchsorted(valid, start, side='left'))
+        hi = self.valid if end is None else int(np.searchsorted(valid, end, side='right'))
+        return lo, max(lo, hi)
+
+
+def nearest_positions(sorted_values, targets):
+    """Position of the closest element of sorted_values for every target.
+
+    Ties go to the earlier element, like Series.idxmin() on absolute differences.
+    """
+    sorted_values = np.asarray(sorted_values)
+    targets = np.asarray(targets)
+    if len(sorted_values) == 1:
+        return np.zeros(len(targets), dtype=np.intp)
+    right = np.clip(np.searchsorted(sorted_values, targets, side='left'), 1, len(sorted_values) - 1)
+    left = right - 1
+    take_left = np.abs(targets - sorted_values[left]) <= np.abs(sorted_values[right] - targets)
+    return np.where(take_left, left, right)
+
+
+def shift_months(dates, months):
+    """The same day `months` calendar months earlier, clipped to month end like pd.DateOffset.
+
+    The result has the unit of `dates`; any time of day is kept.
+    """
+    dates = np.asarray(dates)
+    days = dates.astype('datetime64[D]')
+    month = days.astype('datetime64[M]')
+    day_of_month = days - month.astype('datetime64[D]')
+    time_of_day = dates - days
+
+    target_month = month - months
+    month_length = (target_month + 1).astype('datetime64[D]') - target_month.astype('datetime64[D]')
+    target_day = target_month.astype('datetime64[D]') + np.minimum(day_of_month, month_length - 1)
+    return target_day + time_of_day
+
+
+# Periods (in months) behind the 1M..10Y returns, CAGR metrics and rolling distributions
+LOOKBACK_MONTHS = (1, 3, 6, 12, 36, 60, 84, 120)
+
+
+class LookbackIndex(DateIndex):
+    """DateIndex that also maps every row to the row N calendar months earlier.
+
+    The target of row i is the last row dated on or before date[i] minus N
+    months, found for all rows with a single searchsorted. Positions for
+    LOOKBACK_MONTHS are built up front and kept; other periods are computed
+    on every use, so arbitrary request parameters cannot grow the index.
+    """
+
+    __slots__ = ('_positions',)
+
+    def __init__(self, dates, months=LOOKBACK_MONTHS):
+        super().__init__(dates)
+        self._positions = {}
+        self._positions = {n: self.positions(n) for n in months}
+
+    def positions(self, months):
+        """Row position `months` before each valid row (-1 where the data starts later)"""
+        positions = self._positions.get(months)
+        if positions is None:
+            valid = self.dates[:self.valid]
+            # int32 halves the memory of every period; row counts are far below 2**31
+            positions = (np.searchsorted(valid, shift_months(valid, months), side='right') - 1).astype(np.int32)
+        return positions
+
+    def extended(self, dates):
+        """LookbackIndex over `dates`, which continue this index's valid dates with later ones.
+
+        Only the new rows are searched: O(new rows x periods) instead of a rebuild.
+        """
+        index = LookbackIndex.__new__(LookbackIndex)
+        index.dates = dates
+        index.valid = len(dates)
+        new = dates[self.valid:]
+        index._positions = {
+            months: np.concatenate([
+                positions,
+                (np.searchsorted(dates, shift_months(new, months), side='right') - 1).astype(np.int32),
+            ])
+            for months, positions in self._positions.items()
+        }
+        return index
+
+    def positions_nbytes(self):
+        """Memory held by the lookback positions"""
+        return sum(positions.nbytes for positions in self._positions.values())
+
+    def row_at(self, end=None):
+        """Last valid row on or before `end` (default: the last row), or None"""
+        row = self.window(None, end)[1] - 1
+        return row if row >= 0 else None
+
+    def lookback(self, row, months):
+        """Row position `months` before `row`, or None without enough history"""
+        if row is None:
+            return None
+        if months in self._positions:
+            past = int(self._positions[months][row])
+        else:
+            target = shift_months(self.dates[row], months)
+            past = int(np.searchsorted(self.dates[:self.valid], target, side='right')) - 1
+        return past if past >= 0 else None
@@ -0,0 +1,79 @@
+"""Vectorized resampling and shape-preserving downsampling of chart series."""
+import numpy as np
+
+RESOLUTIONS = ('daily', 'weekly', 'monthly')
+
+
+def period_starts(dates, resolution='monthly'):
+    """Positions of the first row of each day/week/month in sorted datetime64 dates.
+
+    Weeks start on Monday (1970-01-01 was a Thursday, hence the +3).
+    """
+    dates = np.asarray(dates)
+    if len(dates) == 0:
+        return np.zeros(0, dtype=np.intp)
+    if resolution == 'monthly':
+        period = dates.astype('datetime64[M]').astype(np.int64)
+    elif resolution == 'weekly':
+        period = (dates.astype('datetime64[D]').astype(np.int64) + 3) // 7
+    elif resolution == 'daily':
+        period = dates.astype('datetime64[D]').astype(np.int64)
+    else:
+        raise ValueError(f'Unknown resolution {resolution!r}')
+    return np.flatnonzero(np.r_[True, period[1:] != period[:-1]])
+
+
+def ffill(values):
+    """Forward-fill NaN values (leading NaN stays NaN)"""
+    values = np.asarray(values, dtype=np.float64)
+    idx = np.where(np.isnan(values), 0, np.arange(len(values)))
+    np.maximum.accumulate(idx, out=idx)
+    return values[idx]
+
+
+def lttb_indices(x, series, max_points):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The interior points are split into max_points - 2 buckets and each bucket
+    keeps the point forming the largest triangle with the neighbouring
+    buckets' averages (summed over every series, each scaled to its range).
+    Using bucket averages for both neighbours instead of the previously chosen
+    point lets all buckets be evaluated at once in NumPy; the first and last
+    points are always kept.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if max_points is None or n <= max_points:
+        return np.arange(n)
+    if max_points < 3:
+        return np.array([0, n - 1])[:max_points]
+
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.intp)
+    starts, ends = edges[:-1], edges[1:]
+    n_buckets = len(starts)
+    bucket = np.repeat(np.arange(n_buckets), ends - starts)
+    interior = np.arange(1, n - 1)
+
+    def bucket_means(values):
+        sums = np.add.reduceat(values[1:n - 1], starts - 1)
+        means = sums / (ends - starts)
+        # Neighbour averages; the outer buckets use the fixed end points
+        prev_avg = np.r_[values[0], means[:-1]]
+        next_avg = np.r_[means[1:], values[n - 1]]
+        return prev_avg[bucket], next_avg[bucket]
+
+    ax, cx = bucket_means(x)
+    area = np.zeros(n - 2)
+    for values in series:
+        y = ffill(values)
+        y = np.where(np.isnan(y), 0.0, y)
+        span = np.ptp(y) or 1.0
+        y = y / span
+        ay, cy = bucket_means(y)
+        area += np.abs((ax - cx) * (y[interior] - ay) - (ax - x[interior]) * (cy - ay))
+
+    # First position holding each bucket's maximum area
+    order = np.lexsort((-area, bucket))
+    first_in_bucket = np.r_[True, bucket[order][1:] != bucket[order][:-1]]
+    picks = interior[order[first_in_bucket]]
+    return np.r_[0, picks, n - 1]
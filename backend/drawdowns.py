@@ -0,0 +1,101 @@
+"""Drawdown curve, drawdown episodes and time under water of a NAV series.
+
+Everything is a few vectorised passes over the window's NAVs:
+- the running peak (np.maximum.accumulate, or the peaks a BasketSeries keeps)
+  gives the drawdown of every row, navs / peak - 1
+- runs of rows below their peak are the episodes: an episode starts at the
+  peak before the run, bottoms at the run's deepest row and recovers on the
+  first row back at the peak (none if the window ends under water)
+- each episode's depth and trough come from reduceat over the runs, so no
+  Python loop touches the rows
+"""
+import numpy as np
+
+# Episodes returned by default and at most
+DEFAULT_EPISODES = 5
+MAX_EPISODES = 20
+
+
+def drawdown_curve(navs, peaks=None):
+    """Drawdown of every row from its running peak (0 at a peak, -0.2 for 20% below)"""
+    navs = np.asarray(navs, dtype=np.float64)
+    peaks = np.maximum.accumulate(navs) if peaks is None else np.asarray(peaks, dtype=np.float64)
+    return navs / peaks - 1
+
+
+def episodes(drawdown):
+    """(peak, trough, recovery, depth) row arrays of every run under water, in date order.
+
+    recovery is -1 for an episode still under water at the last row.
+    """
+    under = drawdown < 0
+    edges = np.diff(np.r_[0, under.astype(np.int8), 0])
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) == 0:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty, empty, np.zeros(0)
+
+    rows = np.flatnonzero(under)
+    lengths = ends - starts
+    offsets = np.r_[0, np.cumsum(lengths)[:-1]]
+    depth = np.minimum.reduceat(drawdown[rows], offsets)
+    # First row of each run that reaches its depth
+    episode = np.repeat(np.arange(len(starts)), lengths)
+    at_depth = drawdown[rows] == depth[episode]
+    _, first = np.unique(episode[at_depth], return_index=True)
+    troughs = rows[at_depth][first]
+    # A run starting on the first row has no earlier peak; it is measured from that row's own peak
+    peaks = np.maximum(starts - 1, 0)
+    recoveries = np.where(ends < len(drawdown), ends, -1)
+    return peaks, troughs, recoveries, depth
+
+
+def days_between(dates, a, b):
+    return ((dates[b] - dates[a]) / np.timedelta64(1, 'D')).astype(np.int64)
+
+
+def drawdown_summary(dates, navs, peaks=None, top=DEFAULT_EPISODES):
+    """(drawdown curve, {'maxDrawdown', 'episodes', 'underwater'}) of NAVs on sorted daily dates.
+
+    `episodes` are the `top` deepest, deepest first. `underwater` describes
+    time spent below the running peak: the share of rows, the number of
+    episodes, their longest, mean and median length in days, and the
+    current drawdown with the days since its peak.
+    """
+    dates = np.asarray(dates).astype('datetime64[D]')
+    curve = drawdown_curve(navs, peaks)
+    peak_rows, trough_rows, recovery_rows, depth = episodes(curve)
+    last = len(dates) - 1
+    recovered = recovery_rows >= 0
+    end_rows = np.where(recovered, recovery_rows, last)
+    durations = days_between(dates, peak_rows, end_rows)
+
+    deepest = np.argsort(depth, kind='stable')[:top]
+    listed = [{
+        'peakDate': str(dates[peak_rows[i]]),
+        'troughDate': str(dates[trough_rows[i]]),
+        'recoveryDate': str(dates[recovery_rows[i]]) if recovered[i] else None,
+        'depth': round(float(depth[i]) * 100, 2),
+        'declineDays': int(days_between(dates, peak_rows[i], trough_rows[i])),
+        'recoveryDays': int(days_between(dates, trough_rows[i], recovery_rows[i])) if recovered[i] else None,
+        'durationDays': int(durations[i]),
+        'recovered': bool(recovered[i]),
+    } for i in deepest]
+
+    ongoing = len(depth) and not recovered[-1]
+    underwater = {
+        'share': round(float((curve < 0).mean()) * 100, 2) if len(curve) else 0,
+        'episodes': len(depth),
+        'longestDays': int(durations.max()) if len(durations) else 0,
+        'meanDays': round(float(durations.mean()), 1) if len(durations) else 0,
+        'medianDays': round(float(np.median(durations)), 1) if len(durations) else 0,
+        'currentDrawdown': round(float(curve[-1]) * 100, 2) if len(curve) else 0,
+        'currentDays': int(durations[-1]) if ongoing else 0,
+    }
+    summary = {
+        'maxDrawdown': round(float(depth.min()) * 100, 2) if len(depth) else 0,
+        'episodes': listed,
+        'underwater': underwater,
+    }
+    return curve, summary
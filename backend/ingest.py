@@ -0,0 +1,94 @@
+"""Parse the NIFTY CSV and the basket workbooks into normalised NAV arrays.
+
+openpyxl parsing is CPU-bound and each workbook takes a few hundred
+milliseconds, so workbooks without a fresh binary cache are parsed in a
+ProcessPoolExecutor, one workbook per process. Each worker also does the
+per-file normalisation (column renaming, to_datetime with
+errors='coerce', sorting) and sends back only the compact date and NAV
+arrays, so a full reload takes about as long as the slowest workbook.
+Workbooks whose cache is fresh load from .npz in milliseconds and stay in
+the calling process.
+
+ALPHANIFTY_INGEST_WORKERS caps the pool size (default: one per CPU); set it
+to 1 to parse everything in-process.
+"""
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from workbook_cache import cache_status, read_workbook
+
+logger = logging.getLogger(__name__)
+
+INGEST_WORKERS = int(os.environ.get('ALPHANIFTY_INGEST_WORKERS', '0')) or os.cpu_count() or 1
+
+
+def read_nifty_csv(path, nav_dtype='float64'):
+    """NIFTY 50 closes from the CSV as {'dates', 'nifty'} arrays, sorted by date"""
+    import pandas as pd
+
+    df = pd.read_csv(path)
+    df['DATE'] = pd.to_datetime(df['DATE'], format='%d/%m/%y')
+    df = df.sort_values('DATE')
+    return {
+        'dates': df['DATE'].to_numpy().astype('datetime64[D]'),
+        'nifty': df['NIFTY 50'].to_numpy(dtype=nav_dtype),
+    }
+
+
+def ingest_workbook(path, columns, basket_column, nifty_column, nav_dtype='float64'):
+    """Read one basket workbook and return its {'dates', 'basket', 'nifty'} arrays.
+
+    `columns` renames the workbook's columns first (None keeps them).
+    Unparseable dates become NaT and sort last.
+    """
+    df = read_workbook(path)
+    if columns is not None:
+        df.columns = columns
+    return frame_arrays(df, 'DATE', basket_column, nifty_column, nav_dtype)
+
+
+def frame_arrays(df, date_column, basket_column, nifty_column, nav_dtype='float64'):
+    """Date-sorted {'dates', 'basket', 'nifty'} arrays from columns of a frame (basket may be None)"""
+    import pandas as pd
+
+    dates = pd.to_datetime(df[date_column], errors='coerce')
+    order = np.argsort(dates.to_numpy(), kind='stable')
+    return {
+        'dates': dates.to_numpy()[order].astype('datetime64[D]'),
+        'basket': None if basket_column is None else df[basket_column].to_numpy(dtype=nav_dtype)[order],
+        'nifty': df[nifty_column].to_numpy(dtype=nav_dtype)[order],
+    }
+
+
+def ingest_workbooks(workbooks, nav_dtype='float64', workers=None):
+    """{name: (path, columns, basket_column, nifty_column)} -> {name: arrays}, in the same order.
+
+    Workbooks that need parsing go to a process pool when there are at
+    least two of them; if the pool can't be started the work falls back to
+    this process.
+    """
+    workers = INGEST_WORKERS if workers is None else workers
+    nav_dtype = str(nav_dtype)
+    to_parse = [name for name, (path, *_) in workbooks.items() if cache_status(path) in ('missing', 'stale')]
+
+    arrays = {}
+    if workers > 1 and len(to_parse) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(to_parse))) as pool:
+                futures = {name: pool.submit(ingest_workbook, *workbooks[name], nav_dtype) for name in to_parse}
+                arrays = {name: future.result() for name, future in futures.items()}
+            for result in arrays.values():
+                # Unpickled datetime64 dtypes carry empty metadata, which np.save warns about
+                result['dates'] = result['dates'].view('datetime64[D]')
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning('Parallel workbook ingestion failed, parsing in-process: %s', e)
+            arrays = {}
+
+    return {
+        name: arrays[name] if name in arrays else ingest_workbook(*spec, nav_dtype)
+        for name, spec in workbooks.items()
+    }
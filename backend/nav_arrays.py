@@ -0,0 +1,106 @@
+"""Memory-mapped NAV arrays shared by every gunicorn worker.
+
+Each worker used to hold its own copy of the NIFTY and basket data.
+Instead, the normalised date and NAV arrays are written once per data
+version as plain .npy files and every worker maps them read-only
+(np.load(mmap_mode='r')), so the OS page cache keeps a single copy however
+many workers run.
+
+A version directory is complete once its manifest.json exists; it is
+written to a temporary directory and renamed into place, so concurrent
+workers never see half-written arrays. Set ALPHANIFTY_SHARED_ARRAYS=0 to
+keep the arrays on each worker's heap instead.
+"""
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+ARRAY_DIR = os.environ.get('ALPHANIFTY_ARRAY_DIR', os.path.join(BACKEND_DIR, '.cache', 'arrays'))
+ENABLED = os.environ.get('ALPHANIFTY_SHARED_ARRAYS', '1') != '0'
+
+# Bump when the on-disk layout (or what the arrays hold) changes so old arrays are
+# rewritten; 3: arrays are repaired at ingest (nav_quality.py)
+ARRAY_FORMAT = 3
+
+MANIFEST = 'manifest.json'
+
+
+def version_dir(version):
+    return os.path.join(ARRAY_DIR, f'v{ARRAY_FORMAT}-{version}')
+
+
+def publish(series, version):
+    """Write {name: {key: array}} as .npy files for a data version.
+
+    Does nothing if that version is already published. Returns True when
+    the arrays are available afterwards.
+    """
+    directory = version_dir(version)
+    if os.path.exists(os.path.join(directory, MANIFEST)):
+        return True
+
+    tmp_dir = f'{directory}.{os.getpid()}.tmp'
+    manifest = {'format': ARRAY_FORMAT, 'version': version, 'series': {}}
+    try:
+        os.makedirs(tmp_dir, exist_ok=True)
+        for name, arrays in series.items():
+            manifest['series'][name] = list(arrays)
+            for key, values in arrays.items():
+                np.save(os.path.join(tmp_dir, f'{name}.{key}.npy'), values)
+        with open(os.path.join(tmp_dir, MANIFEST), 'w') as f:
+            json.dump(manifest, f)
+        os.rename(tmp_dir, directory)
+    except OSError as e:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        # Another worker may have published the same version first
+        if os.path.exists(os.path.join(directory, MANIFEST)):
+            return True
+        logger.warning('Could not publish shared NAV arrays: %s', e)
+        return False
+
+    _prune(directory)
+    return True
+
+
+def open_arrays(version):
+    """{name: {key: array}} as read-only memory maps, or None if not published"""
+    directory = version_dir(version)
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    return {
+        name: {key: np.load(os.path.join(directory, f'{name}.{key}.npy'), mmap_mode='r') for key in keys}
+        for name, keys in manifest['series'].items()
+    }
+
+
+def load_shared(version, loader):
+    """Arrays for a data version, mapped from disk; `loader()` builds them when missing"""
+    if not ENABLED:
+        return loader()
+
+    series = open_arrays(version)
+    if series is None:
+        built = loader()
+        if publish(built, version):
+            series = open_arrays(version)
+        if series is None:
+            series = built
+    return series
+
+
+def _prune(keep):
+    """Remove other published versions; workers still mapping them keep their pages"""
+    for entry in os.listdir(ARRAY_DIR):
+        path = os.path.join(ARRAY_DIR, entry)
+        if path != keep and not entry.endswith('.tmp'):
+            shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,139 @@
+"""Validate and repair NAV arrays once at ingest, so the request path can assume clean data.
+
+Every series read from a workbook or the NIFTY CSV goes through repair(),
+which is vectorised and runs once per data version, before the arrays are
+published to the workers (see nav_arrays.py):
+
+1. rows without a date (NaT from to_datetime(errors='coerce')) are dropped
+2. rows are sorted by date and, for a repeated date, the last row wins
+3. NAVs that are zero, negative or infinite are flagged and treated as missing
+4. missing NAVs are forward-filled from the previous trading day; rows before
+   the first day on which every NAV is present are dropped
+
+The trading calendar is the series' own dates, so no days are invented;
+stretches of more than GAP_DAYS calendar days without a row are only
+reported. Afterwards dates are strictly increasing and every NAV is
+positive and finite.
+
+What was repaired is collected per series into a data-quality report,
+logged, written to .cache/data_quality.json (ALPHANIFTY_QUALITY_REPORT)
+and served by GET /api/data-quality.
+"""
+import json
+import logging
+import os
+import time
+
+import numpy as np
+
+from downsample import ffill
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT_PATH = os.environ.get('ALPHANIFTY_QUALITY_REPORT', os.path.join(BACKEND_DIR, '.cache', 'data_quality.json'))
+
+# Longer runs of calendar days without a row are listed as gaps
+GAP_DAYS = 7
+
+# At most this many dates are listed per kind of issue
+MAX_LISTED = 20
+
+
+def listed(dates):
+    return np.datetime_as_string(dates[:MAX_LISTED], unit='D').tolist()
+
+
+def repair(dates, basket, nifty):
+    """(clean {'dates', 'basket', 'nifty'} arrays, report) for one series.
+
+    Without basket NAVs (basket None, the benchmark) there is no 'basket'
+    key. NAV arrays keep their dtype.
+    """
+    dates = np.asarray(dates).astype('datetime64[D]')
+    navs = {'basket': basket, 'nifty': nifty}
+    navs = {key: np.asarray(values) for key, values in navs.items() if values is not None}
+    report = {'rows': len(dates)}
+
+    undated = np.isnat(dates)
+    order = np.argsort(dates, kind='stable')[:len(dates) - int(undated.sum())]
+    dates = dates[order]
+    # Sorted, so a repeated date is the same as the next row's
+    last_of_day = np.r_[dates[1:] != dates[:-1], True]
+    report['undatedDropped'] = int(undated.sum())
+    report['duplicateDates'] = listed(np.unique(dates[~last_of_day]))
+    report['duplicatesDropped'] = int((~last_of_day).sum())
+    dates = dates[last_of_day]
+    navs = {key: values[order][last_of_day] for key, values in navs.items()}
+
+    complete = np.ones(len(dates), dtype=bool)
+    missing = {}
+    report['nonPositive'] = {}
+    for key, values in navs.items():
+        invalid = ~np.isnan(values) & ~(np.isfinite(values) & (values > 0))
+        report['nonPositive'][key] = listed(dates[invalid])
+        missing[key] = np.isnan(values) | invalid
+        complete &= np.logical_or.accumulate(~missing[key])
+        navs[key] = ffill(np.where(missing[key], np.nan, values)).astype(values.dtype, copy=False)
+
+    # Rows before the first complete one have nothing to fill from
+    first = int(np.argmax(complete)) if complete.any() else len(dates)
+    report['leadingDropped'] = first
+    report['filled'] = {key: int(mask[first:].sum()) for key, mask in missing.items()}
+    dates = dates[first:]
+    navs = {key: values[first:] for key, values in navs.items()}
+
+    steps = np.diff(dates).astype(np.int64)
+    gaps = np.flatnonzero(steps > GAP_DAYS)[:MAX_LISTED]
+    report['gaps'] = [[str(dates[i]), str(dates[i + 1]), int(steps[i])] for i in gaps]
+    report['kept'] = len(dates)
+    report['first'] = str(dates[0]) if len(dates) else None
+    report['last'] = str(dates[-1]) if len(dates) else None
+    report['clean'] = (report['kept'] == report['rows'] and not any(report['filled'].values())
+                       and not any(report['nonPositive'].values()))
+    return {'dates': dates, **navs}, report
+
+
+def repair_all(series):
+    """({name: clean arrays}, {name: report}) for {name: {'dates', 'basket', 'nifty'}}"""
+    cleaned, reports = {}, {}
+    for name, arrays in series.items():
+        cleaned[name], reports[name] = repair(arrays['dates'], arrays.get('basket'), arrays['nifty'])
+        report = reports[name]
+        if not report['clean']:
+            logger.warning(
+                'Repaired %s: %d undated and %d duplicate rows dropped, %d leading rows dropped, '
+                'non-positive NAVs on %s, %s missing NAVs filled',
+                name, report['undatedDropped'], report['duplicatesDropped'], report['leadingDropped'],
+                report['nonPositive'], report['filled'],
+            )
+        if not report['kept']:
+            raise ValueError(f'{name} has no valid rows')
+    return cleaned, reports
+
+
+def write_report(reports, version, path=None):
+    """Merge per-series reports into the report file (replacing those series); returns the report"""
+    path = path or REPORT_PATH
+    report = read_report(path) or {'series': {}}
+    report['series'].update(reports)
+    report['version'] = version
+    report['generatedAt'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning('Could not write the data-quality report: %s', e)
+    return report
+
+
+def read_report(path=None):
+    """The last written report, or None"""
+    try:
+        with open(path or REPORT_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,400 @@
+"""Local SQLite store of basket and benchmark NAV histories.
+
+Every series, whatever file it came from, is kept in one table keyed by
+(basket_id, date), so a date range of one basket is a walk along the
+primary key rather than a scan of a whole frame:
+
+    navs(basket_id TEXT, date TEXT 'YYYY-MM-DD', basket_nav REAL, nifty_nav REAL)
+
+The NIFTY 50 benchmark itself is stored as basket 'nifty' with only
+nifty_nav set. The database runs in WAL mode, so the API can read while an
+import is writing.
+
+Sources are imported with one command each. Column names are detected
+(DATE, the NIFTY column, and the single remaining NAV column), and ids
+default to the file name, e.g. 'New Basket.xlsx' becomes new_basket. A
+default id that is one of APP_SERIES gets IMPORT_SUFFIX, e.g. 'White
+Basket.xlsx' becomes white_basket_import:
+
+    python nav_store.py import "New Basket.xlsx" [--id new_basket]
+    python nav_store.py import nifty_data.csv --id nifty_50
+    python nav_store.py import ../basket_data.json    # one basket per key
+    python nav_store.py list
+    python nav_store.py query new_basket --start 2024-01-01 --end 2024-12-31
+
+Importing a series replaces whatever was stored under its id. Daily rows
+are added with append, which only accepts dates after the last stored one
+(and, for the app's own series, after the last date of their source file):
+
+    python nav_store.py append great_india 2025-11-11,812.4,26120.5
+
+The ids of the series app.py loads from its own files (APP_SERIES) hold
+only rows appended on top of those files, so they cannot be imported into.
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+import nav_quality
+
+logger = logging.getLogger(__name__)
+
+# Series app.py loads from its source files ({id: file in backend/}, as in its
+# SOURCE_FILES). Under these ids the store holds only daily rows appended after
+# the files' last date, which app.py applies on top of them; imports may not use them.
+APP_SERIES = {
+    'nifty': 'nifty_data.csv',
+    'white_basket': 'White Basket.xlsx',
+    'every_common': 'every_common_india.xlsx',
+    'raising_india': 'Raising_India.xlsx',
+    'great_india': 'Greate India Basket.xlsx',
+    'aggressive_basket': 'aggresive basket.xlsx',
+    'conservative_basket': 'CONSERVATIVE BASKET.xlsx',
+    'dusshera_basket': 'Dusshera basket.xlsx',
+    'yellow_basket': 'Yellow basket.xlsx',
+}
+
+# Added to a default import id that is one of APP_SERIES
+IMPORT_SUFFIX = '_import'
+
+# baskets.source of a basket created by append_series
+APPEND_SOURCE = 'append'
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.environ.get('ALPHANIFTY_NAV_DB', os.path.join(BACKEND_DIR, 'nav_store.sqlite3'))
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS baskets (
+    basket_id   TEXT PRIMARY KEY,
+    name        TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    imported_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS navs (
+    basket_id  TEXT NOT NULL,
+    date       TEXT NOT NULL,
+    basket_nav REAL,
+    nifty_nav  REAL,
+    PRIMARY KEY (basket_id, date)
+) WITHOUT ROWID;
+'''
+
+
+def connect(path=None, readonly=False):
+    """Open the store (creating it unless readonly) in WAL mode"""
+    path = path or DB_PATH
+    if readonly:
+        conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+    else:
+        conn = sqlite3.connect(path)
+        conn.execute('PRAGMA journal_mode=WAL')
+        # WAL commits are durable at checkpoints; NORMAL skips the fsync per commit
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript(SCHEMA)
+    conn.execute('PRAGMA busy_timeout=5000')
+    return conn
+
+
+def slugify(name):
+    """Basket id for a file or key name: 'Raising India.xlsx' -> 'raising_india'"""
+    stem = os.path.splitext(os.path.basename(name))[0]
+    return re.sub(r'[^a-z0-9]+', '_', stem.lower()).strip('_')
+
+
+def date_column_of(columns):
+    """The column named DATE in any case, else the first one"""
+    return next((c for c in columns if c.strip().upper() == 'DATE'), columns[0])
+
+
+def detect_columns(columns, basket_column=None, nifty_column=None):
+    """(date, basket, nifty) column names of a NAV frame.
+
+    DATE is matched case-insensitively (else the first column), NIFTY is the
+    column whose name starts with NIFTY in any spelling ('NIFTY 50',
+    'NIFTY_50', 'NIFTY '), and the basket NAV is the one column left, or
+    None when there is none (the benchmark itself). Either NAV column can
+    be given explicitly instead. Raises ValueError.
+    """
+    columns = [str(c) for c in columns]
+    date_column = date_column_of(columns)
+    if nifty_column is None:
+        niftys = [c for c in columns if c.strip().upper().startswith('NIFTY')]
+        if len(niftys) != 1:
+            raise ValueError(f'Cannot tell which column is NIFTY among {columns}; pass --nifty-column')
+        nifty_column = niftys[0]
+    if basket_column is None:
+        rest = [c for c in columns if c not in (date_column, nifty_column)]
+        if len(rest) > 1:
+            raise ValueError(f'Cannot tell which column is the basket NAV among {rest}; pass --basket-column')
+        basket_column = rest[0] if rest else None
+    return date_column, basket_column, nifty_column
+
+
+def frame_series(df, basket_column=None, nifty_column=None):
+    """Date-sorted {'dates', 'basket', 'nifty'} arrays of a frame with detected columns.
+
+    The arrays get the same repairs as the app's ingest (nav_quality.repair):
+    rows without a parseable date are dropped, the last row wins for a
+    repeated date (so (basket_id, date) stays unique) and missing or
+    non-positive NAVs are forward-filled. Repairs are logged as warnings.
+    """
+    from ingest import frame_arrays
+
+    df = df.rename(columns=str)
+    arrays = frame_arrays(df, *detect_columns(df.columns, basket_column, nifty_column))
+    cleaned, report = nav_quality.repair(arrays['dates'], arrays['basket'], arrays['nifty'])
+    if not report['clean']:
+        logger.warning('Repaired the imported rows: %d undated and %d duplicate rows dropped, '
+                       '%d leading rows dropped, non-positive NAVs on %s, %s missing NAVs filled',
+                       report['undatedDropped'], report['duplicatesDropped'], report['leadingDropped'],
+                       report['nonPositive'], report['filled'])
+    return {'basket': None, **cleaned}
+
+
+def read_source(path, basket_column=None, nifty_column=None):
+    """{basket_id: (name, arrays)} for an .xlsx, .csv or basket_data.json-style .json file"""
+    import pandas as pd
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.json':
+        # basket_data.json starts with a UTF-8 BOM and lists rows newest first
+        with open(path, encoding='utf-8-sig') as f:
+            data = json.load(f)
+        return {
+            slugify(key): (key, frame_series(pd.DataFrame(rows), basket_column, nifty_column))
+            for key, rows in data.items()
+        }
+    if ext == '.csv':
+        df = pd.read_csv(path).rename(columns=str)
+        date_column = date_column_of(list(df.columns))
+        # The NIFTY CSV writes dates as dd/mm/yy
+        df[date_column] = pd.to_datetime(df[date_column], format='mixed', dayfirst=True, errors='coerce')
+    else:
+        from workbook_cache import read_workbook
+        df = read_workbook(path)
+    return {slugify(path): (os.path.basename(path), frame_series(df, basket_column, nifty_column))}
+
+
+def import_series(conn, basket_id, arrays, name, source):
+    """Replace the stored rows of one basket with {'dates', 'basket', 'nifty'} arrays.
+
+    Raises ValueError for one of APP_SERIES, whose rows would be applied to
+    the app's own series as appends.
+    """
+    if basket_id in APP_SERIES:
+        raise ValueError(f'{basket_id} is reserved for rows appended to the app\'s own series; use another --id')
+    dates = np.datetime_as_string(arrays['dates'], unit='D').tolist()
+    basket = [None] * len(dates) if arrays['basket'] is None else arrays['basket'].tolist()
+    nifty = arrays['nifty'].tolist()
+    with conn:
+        conn.execute('DELETE FROM navs WHERE basket_id = ?', (basket_id,))
+        conn.executemany(
+            'INSERT INTO navs (basket_id, date, basket_nav, nifty_nav) VALUES (?, ?, ?, ?)',
+            zip([basket_id] * len(dates), dates, basket, nifty),
+        )
+        conn.execute(
+            'INSERT OR REPLACE INTO baskets (basket_id, name, source, imported_at) VALUES (?, ?, ?, ?)',
+            (basket_id, name, os.path.basename(source), time.strftime('%Y-%m-%dT%H:%M:%S')),
+        )
+    return len(dates)
+
+
+def source_last_date(basket_id):
+    """Last date in the source file app.py loads one of APP_SERIES from"""
+    import pandas as pd
+
+    path = os.path.join(BACKEND_DIR, APP_SERIES[basket_id])
+    if path.endswith('.csv'):
+        df = pd.read_csv(path)
+        dates = pd.to_datetime(df[date_column_of(list(df.columns))], format='%d/%m/%y', errors='coerce')
+    else:
+        from workbook_cache import read_workbook
+        df = read_workbook(path)
+        dates = pd.to_datetime(df[date_column_of([str(c) for c in df.columns])], errors='coerce')
+    return np.datetime64(dates.max(), 'D')
+
+
+def append_series(conn, basket_id, arrays, after=None):
+    """Add rows dated after the last stored row of a basket (creating it if new).
+
+    Raises ValueError, before anything is written, when a date is not after
+    the stored ones (so the store stays append-only), when a NAV is not
+    positive, when basket NAVs are missing for a basket or given for a
+    benchmark, or when one of APP_SERIES holds rows imported by an older
+    version. Rows for one of APP_SERIES must also be dated after its source
+    file's last date, `after` (read from the file when not given), as app.py
+    would never apply them. Returns the number of rows added.
+    """
+    dates = np.datetime_as_string(arrays['dates'], unit='D').tolist()
+    if sorted(set(dates)) != dates:
+        raise ValueError('dates must be strictly increasing')
+    # Appended rows skip the ingest repairs (nav_quality.py), so they must already be clean
+    for values in (arrays['basket'], arrays['nifty']):
+        if values is not None and not (np.isfinite(values) & (values > 0)).all():
+            raise ValueError('NAVs must be positive numbers')
+    basket = [None] * len(dates) if arrays['basket'] is None else arrays['basket'].tolist()
+    nifty = arrays['nifty'].tolist()
+    if basket_id in APP_SERIES and dates:
+        after = source_last_date(basket_id) if after is None else np.datetime64(after, 'D')
+        if dates[0] <= str(after):
+            raise ValueError(f'{APP_SERIES[basket_id]} already has rows up to {after}')
+    with conn:
+        stored = conn.execute('SELECT source FROM baskets WHERE basket_id = ?', (basket_id,)).fetchone()
+        if basket_id in APP_SERIES and stored is not None and stored[0] != APPEND_SOURCE:
+            raise ValueError(f'{basket_id} holds rows imported from {stored[0]}; delete them before appending')
+        last, last_basket = conn.execute(
+            'SELECT date, basket_nav FROM navs WHERE basket_id = ? ORDER BY date DESC LIMIT 1', (basket_id,)
+        ).fetchone() or (None, None)
+        if basket_id in APP_SERIES:
+            is_basket = basket_id != 'nifty'
+        else:
+            is_basket = arrays['basket'] is not None if last is None else last_basket is not None
+        if (arrays['basket'] is None) == is_basket:
+            raise ValueError(f'{basket_id} is a basket, so BASKET_NAV is required' if is_basket
+                             else f'{basket_id} is a benchmark, so BASKET_NAV must be empty')
+        if dates and last is not None and dates[0] <= last:
+            raise ValueError(f'{basket_id} already has rows up to {last}')
+        conn.executemany(
+            'INSERT INTO navs (basket_id, date, basket_nav, nifty_nav) VALUES (?, ?, ?, ?)',
+            zip([basket_id] * len(dates), dates, basket, nifty),
+        )
+        conn.execute(
+            'INSERT OR IGNORE INTO baskets (basket_id, name, source, imported_at) VALUES (?, ?, ?, ?)',
+            (basket_id, basket_id, APPEND_SOURCE, time.strftime('%Y-%m-%dT%H:%M:%S')),
+        )
+    return len(dates)
+
+
+def import_file(conn, path, basket_id=None, basket_column=None, nifty_column=None):
+    """Import every series in a file; returns {basket_id: rows}.
+
+    Default ids that are one of APP_SERIES get IMPORT_SUFFIX; an explicit
+    `basket_id` is used as given.
+    """
+    series = read_source(path, basket_column, nifty_column)
+    if basket_id is not None:
+        if len(series) != 1:
+            raise ValueError(f'{os.path.basename(path)} holds {len(series)} series; --id needs exactly one')
+        series = {basket_id: next(iter(series.values()))}
+    else:
+        series = {sid + IMPORT_SUFFIX if sid in APP_SERIES else sid: source for sid, source in series.items()}
+    return {sid: import_series(conn, sid, arrays, name, path) for sid, (name, arrays) in series.items()}
+
+
+def list_baskets(conn):
+    """[{basketId, name, source, importedAt, rows, start, end}] for every stored basket"""
+    rows = conn.execute('''
+        SELECT b.basket_id, b.name, b.source, b.imported_at, COUNT(n.date), MIN(n.date), MAX(n.date)
+        FROM baskets b LEFT JOIN navs n ON n.basket_id = b.basket_id
+        GROUP BY b.basket_id ORDER BY b.basket_id
+    ''').fetchall()
+    keys = ('basketId', 'name', 'source', 'importedAt', 'rows', 'start', 'end')
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def read_series(conn, basket_id, start=None, end=None, source=None):
+    """{'dates', 'basket', 'nifty'} arrays for start <= date <= end (ISO strings or datetime64), or None.
+
+    Uses the (basket_id, date) primary key for the range. With `source`,
+    a basket stored from any other source counts as missing (APPEND_SOURCE
+    reads only baskets built by append_series).
+    """
+    stored = conn.execute('SELECT source FROM baskets WHERE basket_id = ?', (basket_id,)).fetchone()
+    if stored is None or source is not None and stored[0] != source:
+        return None
+    lo = '0000-01-01' if start is None else str(np.datetime64(start, 'D'))
+    hi = '9999-12-31' if end is None else str(np.datetime64(end, 'D'))
+    rows = conn.execute(
+        'SELECT date, basket_nav, nifty_nav FROM navs WHERE basket_id = ? AND date BETWEEN ? AND ? ORDER BY date',
+        (basket_id, lo, hi),
+    ).fetchall()
+    dates, basket, nifty = zip(*rows) if rows else ((), (), ())
+    return {
+        'dates': np.array(dates, dtype='datetime64[D]'),
+        'basket': np.array(basket, dtype=np.float64),
+        'nifty': np.array(nifty, dtype=np.float64),
+    }
+
+
+def parse_rows(rows):
+    """{'dates', 'basket', 'nifty'} arrays from 'DATE,BASKET_NAV,NIFTY' strings (raises ValueError)"""
+    dates, basket, nifty = [], [], []
+    for row in rows:
+        parts = row.split(',')
+        if len(parts) != 3:
+            raise ValueError(f'expected DATE,BASKET_NAV,NIFTY, got {row!r}')
+        dates.append(np.datetime64(parts[0].strip(), 'D'))
+        basket.append(float(parts[1]) if parts[1].strip() else np.nan)
+        nifty.append(float(parts[2]))
+    basket = np.array(basket, dtype=np.float64)
+    return {
+        'dates': np.array(dates, dtype='datetime64[D]'),
+        'basket': None if np.isnan(basket).all() else basket,
+        'nifty': np.array(nifty, dtype=np.float64),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Manage the SQLite NAV store')
+    parser.add_argument('--db', default=None, help=f'database file (default: {DB_PATH})')
+    sub = parser.add_subparsers(dest='command', required=True)
+    imp = sub.add_parser('import', help='Import .xlsx/.csv/.json NAV files, replacing the same ids')
+    imp.add_argument('files', nargs='+')
+    imp.add_argument('--id', dest='basket_id', help='basket id (single-series files only)')
+    imp.add_argument('--basket-column', help='basket NAV column, if it cannot be detected')
+    imp.add_argument('--nifty-column', help='NIFTY column, if it cannot be detected')
+    add = sub.add_parser('append', help='Append rows after the last stored date of a basket')
+    add.add_argument('basket_id')
+    add.add_argument('rows', nargs='*', metavar='DATE,BASKET_NAV,NIFTY',
+                     help="one row each, e.g. 2025-11-11,123.45,26100.5 (BASKET_NAV empty for 'nifty')")
+    add.add_argument('--file', help='.xlsx/.csv with the rows to append instead')
+    sub.add_parser('list', help='Show stored baskets')
+    query = sub.add_parser('query', help='Print the NAVs of a basket in a date range')
+    query.add_argument('basket_id')
+    query.add_argument('--start')
+    query.add_argument('--end')
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    if args.command == 'import':
+        for path in args.files:
+            try:
+                imported = import_file(conn, path, args.basket_id, args.basket_column, args.nifty_column)
+            except (OSError, ValueError, KeyError) as e:
+                print(f'✗ {os.path.basename(path)}: {e}')
+                return 1
+            for basket_id, rows in imported.items():
+                print(f'✓ {os.path.basename(path)} -> {basket_id}: {rows} rows')
+    elif args.command == 'append':
+        try:
+            if args.file:
+                (_, arrays), = read_source(args.file).values()
+            else:
+                arrays = parse_rows(args.rows)
+            rows = append_series(conn, args.basket_id, arrays)
+        except (OSError, ValueError, KeyError) as e:
+            print(f'✗ {args.basket_id}: {e}')
+            return 1
+        print(f'✓ {args.basket_id}: {rows} rows appended')
+    elif args.command == 'list':
+        for b in list_baskets(conn):
+            print(f"{b['basketId']:<24}{b['rows']:>7} rows  {b['start']} .. {b['end']}  ({b['source']})")
+    else:
+        series = read_series(conn, args.basket_id, args.start, args.end)
+        if series is None:
+            print(f'✗ unknown basket {args.basket_id}')
+            return 1
+        for date, basket, nifty in zip(series['dates'], series['basket'], series['nifty']):
+            print(f'{date}  {basket:12.4f}  {nifty:12.4f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,24 @@
+"""Per-process memory figures from /proc, used to watch copy-on-write growth of forked workers."""
+
+
+def memory_usage(pid='self'):
+    """RSS, PSS, shared and private memory of a process in KiB.
+
+    Returns an empty dict where /proc/<pid>/smaps_rollup is unavailable
+    (non-Linux systems, kernels older than 4.14).
+    """
+    fields = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1])
+    except OSError:
+        return {}
+    return {
+        'rss': fields['Rss'],
+        'pss': fields['Pss'],
+        'shared': fields['Shared_Clean'] + fields['Shared_Dirty'],
+        'private': fields['Private_Clean'] + fields['Private_Dirty'],
+    }
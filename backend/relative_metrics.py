@@ -0,0 +1,88 @@
+"""Performance of a basket relative to NIFTY, per trailing window, in one vectorised pass each.
+
+For the basket and NIFTY NAVs of a window (in % unless noted):
+- beta: covariance of daily basket and NIFTY returns / variance of NIFTY's (ratio)
+- alpha: Jensen's alpha, the annualised mean daily excess return over the
+  risk-free rate not explained by beta times NIFTY's
+- trackingError: annualised standard deviation of daily active returns
+  (basket minus NIFTY)
+- informationRatio: annualised mean active return / tracking error (ratio)
+- upCapture, downCapture: the basket's geometric mean monthly return over
+  NIFTY's, in the months NIFTY rose or fell (100 moves with NIFTY)
+
+Daily returns are annualised with the rows the window has per year and
+the risk-free rate is the one risk_metrics.py uses. Monthly returns run
+from month end to month end (the first from the window's first row, the
+last to its last row), taken from the series' precomputed month starts.
+"""
+import numpy as np
+
+from risk_metrics import HORIZONS, MIN_RETURNS, RISK_FREE_RATE
+
+
+def capture(basket_returns, nifty_returns, months):
+    """Geometric mean basket return / NIFTY's over the selected months (%), or None without any"""
+    if not months.any():
+        return None
+    count = int(months.sum())
+    basket_mean = np.prod(1 + basket_returns[months]) ** (1 / count) - 1
+    nifty_mean = np.prod(1 + nifty_returns[months]) ** (1 / count) - 1
+    return round(float(basket_mean / nifty_mean) * 100, 2) if nifty_mean != 0 else None
+
+
+def window_relative(dates, basket, nifty, month_ends, risk_free=RISK_FREE_RATE):
+    """Relative metrics for positive daily NAVs on sorted `dates`, or None for too short a window.
+
+    `month_ends` are the positions of the last row of each month before the
+    window's last row, relative to the window.
+    """
+    basket = np.asarray(basket, dtype=np.float64)
+    nifty = np.asarray(nifty, dtype=np.float64)
+    years = (dates[-1] - dates[0]) / np.timedelta64(1, 'D') / 365.25 if len(dates) else 0
+    if len(basket) <= MIN_RETURNS or years <= 0:
+        return None
+    per_year = (len(basket) - 1) / years
+    daily_free = (1 + risk_free / 100) ** (1 / per_year) - 1
+    basket_returns = basket[1:] / basket[:-1] - 1
+    nifty_returns = nifty[1:] / nifty[:-1] - 1
+
+    nifty_var = nifty_returns.var(ddof=1)
+    beta = np.cov(basket_returns, nifty_returns)[0, 1] / nifty_var if nifty_var > 0 else np.nan
+    alpha = ((basket_returns.mean() - daily_free) - beta * (nifty_returns.mean() - daily_free)) * per_year
+    active = basket_returns - nifty_returns
+    tracking_error = active.std(ddof=1) * np.sqrt(per_year)
+
+    points = np.r_[0, month_ends[(month_ends > 0) & (month_ends < len(basket) - 1)], len(basket) - 1]
+    basket_monthly = basket[points[1:]] / basket[points[:-1]] - 1
+    nifty_monthly = nifty[points[1:]] / nifty[points[:-1]] - 1
+
+    def rounded(value, scale=1):
+        return round(float(value) * scale, 2) if np.isfinite(value) else None
+
+    return {
+        'start': str(dates[0]),
+        'end': str(dates[-1]),
+        'beta': rounded(beta),
+        'alpha': rounded(alpha, 100),
+        'trackingError': rounded(tracking_error, 100),
+        'informationRatio': rounded(active.mean() * per_year / tracking_error) if tracking_error > 0 else None,
+        'upCapture': capture(basket_monthly, nifty_monthly, nifty_monthly > 0),
+        'downCapture': capture(basket_monthly, nifty_monthly, nifty_monthly < 0),
+        'months': len(points) - 1,
+    }
+
+
+def horizon_relative(dates, basket, nifty, month_starts, lookback_index, row, risk_free=RISK_FREE_RATE):
+    """{horizon: relative metrics or None} for the windows ending at `row` (None: no such row)"""
+    month_ends = np.asarray(month_starts)[1:] - 1
+    metrics = {}
+    for key, months in HORIZONS:
+        past = 0 if months is None else lookback_index.lookback(row, months)
+        if row is None or past is None:
+            metrics[key] = None
+            continue
+        window = slice(past, row + 1)
+        inside = month_ends[(month_ends >= past) & (month_ends <= row)] - past
+        metrics[key] = window_relative(dates[window], basket[window], nifty[window], inside, risk_free)
+    return metrics
+
@@ -0,0 +1,87 @@
+"""Reload basket data in the background when its source files change.
+
+Each worker process owns a Reloader. poll() is called on every request and
+at most every `interval` seconds compares the (mtime, size) of the source
+files with what was last loaded; when they differ it runs the reload
+function in a background thread, so requests keep being served from the
+current data meanwhile. start() and run() trigger a reload directly (the
+admin endpoint). Only one reload runs at a time.
+"""
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def file_signatures(paths):
+    """{path: (mtime_ns, size)}, or None for a missing file"""
+    signatures = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            signatures[path] = None
+        else:
+            signatures[path] = (stat.st_mtime_ns, stat.st_size)
+    return signatures
+
+
+class Reloader:
+    """Runs `reload()` when `paths` change; reload() returns a dict describing what it did"""
+
+    def __init__(self, paths, reload, interval=0):
+        self.paths = list(paths)
+        self.reload = reload
+        self.interval = interval
+        self._signatures = file_signatures(self.paths)
+        self._next_check = time.monotonic() + interval
+        self._run_lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._thread = None
+        self._last = None
+
+    def poll(self):
+        """Start a background reload if the files changed; cheap enough to call per request"""
+        if self.interval <= 0 or time.monotonic() < self._next_check:
+            return
+        self._next_check = time.monotonic() + self.interval
+        if file_signatures(self.paths) != self._signatures:
+            self.start()
+
+    def start(self):
+        """Reload in a background thread; returns False if one is already running"""
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(target=self.run, name='data-reload', daemon=True)
+            self._thread.start()
+            return True
+
+    def run(self):
+        """Reload in this thread (after any reload in progress) and return its status"""
+        with self._run_lock:
+            # Taken first, so files replaced during the reload are picked up by the next poll
+            signatures = file_signatures(self.paths)
+            started = time.perf_counter()
+            try:
+                result = {'ok': True, **self.reload()}
+            except Exception as e:
+                logger.exception('Reloading basket data failed, still serving the previous data')
+                result = {'ok': False, 'error': str(e)}
+            # Recorded on failure too: a broken file is retried once it changes again
+            self._signatures = signatures
+            result['seconds'] = round(time.perf_counter() - started, 3)
+            result['finishedAt'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+            self._last = result
+            if result['ok']:
+                logger.info('Reloaded basket data in %.2fs: %s', result['seconds'], result)
+            return result
+
+    def status(self):
+        return {
+            'running': self._run_lock.locked(),
+            'pollInterval': self.interval,
+            'last': self._last,
+        }
@@ -0,0 +1,78 @@
+"""Risk metrics of a NAV series from its daily returns, in one vectorised pass per window.
+
+For the daily NAVs of a window (in % unless noted):
+- volatility: annualised standard deviation of daily returns
+- downsideDeviation: annualised root mean square of the daily returns below
+  the daily risk-free rate (returns above it count as zero)
+- sharpe: annualised mean daily return over the risk-free rate / volatility (ratio)
+- sortino: the same excess return / downside deviation (ratio)
+- maxDrawdown: deepest fall from the window's running peak (negative)
+- calmar: CAGR / |max drawdown| (ratio)
+
+Returns are annualised with the number of rows the series actually has per
+year, so trading-day and calendar-day histories both come out right. The
+risk-free rate is ALPHANIFTY_RISK_FREE_RATE (% a year, default 6.5).
+"""
+import os
+
+import numpy as np
+
+RISK_FREE_RATE = float(os.environ.get('ALPHANIFTY_RISK_FREE_RATE', '6.5'))
+
+# Trailing windows the metrics are computed for, in calendar months (None: all history)
+HORIZONS = (('1Y', 12), ('3Y', 36), ('5Y', 60), ('inception', None))
+
+# Window behind the single risk and Sharpe numbers of a basket payload
+HEADLINE_HORIZON = '3Y'
+
+# A window needs at least this many daily returns
+MIN_RETURNS = 20
+
+
+def window_metrics(dates, navs, risk_free=RISK_FREE_RATE):
+    """Metrics dict for positive daily `navs` on sorted `dates`, or None for too short a window"""
+    navs = np.asarray(navs, dtype=np.float64)
+    years = (dates[-1] - dates[0]) / np.timedelta64(1, 'D') / 365.25 if len(dates) else 0
+    if len(navs) <= MIN_RETURNS or years <= 0:
+        return None
+    per_year = (len(navs) - 1) / years
+    returns = navs[1:] / navs[:-1] - 1
+    excess = returns - ((1 + risk_free / 100) ** (1 / per_year) - 1)
+
+    volatility = returns.std(ddof=1) * np.sqrt(per_year)
+    downside = np.sqrt(np.mean(np.minimum(excess, 0) ** 2) * per_year)
+    annual_excess = excess.mean() * per_year
+    max_drawdown = (navs / np.maximum.accumulate(navs)).min() - 1
+    cagr = (navs[-1] / navs[0]) ** (1 / years) - 1
+
+    def ratio(numerator, denominator):
+        return round(float(numerator / denominator), 2) if denominator > 0 else None
+
+    return {
+        'start': str(dates[0]),
+        'end': str(dates[-1]),
+        'cagr': round(float(cagr) * 100, 2),
+        'volatility': round(float(volatility) * 100, 2),
+        'downsideDeviation': round(float(downside) * 100, 2),
+        'sharpe': ratio(annual_excess, volatility),
+        'sortino': ratio(annual_excess, downside),
+        'maxDrawdown': round(float(max_drawdown) * 100, 2),
+        'calmar': ratio(cagr, -max_drawdown),
+    }
+
+
+def horizon_metrics(dates, navs, lookback_index, row, risk_free=RISK_FREE_RATE):
+    """{horizon: metrics or None} for the windows ending at `row` (None: no such row)"""
+    metrics = {}
+    for key, months in HORIZONS:
+        past = 0 if months is None else lookback_index.lookback(row, months)
+        if row is None or past is None:
+            metrics[key] = None
+        else:
+            metrics[key] = window_metrics(dates[past:row + 1], navs[past:row + 1], risk_free)
+    return metrics
+
+
+def headline(metrics):
+    """The HEADLINE_HORIZON metrics, or those of the whole history when it is shorter (may be None)"""
+    return metrics.get(HEADLINE_HORIZON) or metrics.get('inception')
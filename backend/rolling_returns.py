@@ -0,0 +1,180 @@
+"""Vectorized rolling-CAGR engine shared by the basket graph generators."""
+from datetime import date
+
+import numpy as np
+
+
+def format_month_labels(dates, label_format='%b %Y'):
+    """Format datetime64 values with a month-level strftime pattern.
+
+    Only one label per distinct month is formatted; the rest is a take().
+    """
+    dates = np.asarray(dates)
+    if len(dates) == 0:
+        return []
+    month_ids = dates.astype('datetime64[M]').astype(np.int64)
+    unique_months, inverse = np.unique(month_ids, return_inverse=True)
+    unique_labels = np.array([
+        date(1970 + int(m) // 12, int(m) % 12 + 1, 1).strftime(label_format)
+        for m in unique_months
+    ])
+    return unique_labels[inverse].tolist()
+
+
+def format_day_labels(dates, label_format='%d %b %Y'):
+    """Format datetime64 values with a day-level strftime pattern, once per distinct day"""
+    dates = np.asarray(dates)
+    if len(dates) == 0:
+        return []
+    days, inverse = np.unique(dates.astype('datetime64[D]'), return_inverse=True)
+    unique_labels = np.array([day.item().strftime(label_format) for day in days])
+    return unique_labels[inverse].tolist()
+
+
+def rolling_cagr(dates, basket, nifty, lookback, years, start=0, stop=None,
+                 require_positive=False, label_format='%b %Y', label_rows=None):
+    """Rolling CAGR of the basket and NIFTY for rows start..stop-1 in one pass.
+
+    `lookback` is either a fixed row count (row i is compared with row
+    i - lookback) or an array with the starting row of every row, e.g.
+    LookbackIndex.positions(years * 12); rows without one (-1) are skipped.
+    With `require_positive`, rows whose starting NAVs are not strictly
+    positive are dropped. `label_rows(rows)` returns the labels of row
+    positions (e.g. BasketSeries.labels_at); without it the row dates are
+    formatted with `label_format`.
+
+    Returns (labels, basket_cagr, nifty_cagr) as plain lists rounded to 2dp.
+    """
+    dates = np.asarray(dates)
+    basket = np.asarray(basket, dtype=np.float64)
+    nifty = np.asarray(nifty, dtype=np.float64)
+    stop = len(dates) if stop is None else stop
+    if np.isscalar(lookback):
+        if lookback < 0:
+            return [], [], []
+        start = max(start, lookback)
+        rows = np.arange(start, max(start, stop))
+        past = rows - lookback
+    else:
+        rows = np.arange(start, max(start, stop))
+        past = np.asarray(lookback)[start:stop]
+        has_past = past >= 0
+        rows, past = rows[has_past], past[has_past]
+    if years <= 0 or len(rows) == 0:
+        return [], [], []
+
+    basket_now, basket_past = basket[rows], basket[past]
+    nifty_now, nifty_past = nifty[rows], nifty[past]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        basket_cagr = ((basket_now / basket_past) ** (1 / years) - 1) * 100
+        nifty_cagr = ((nifty_now / nifty_past) ** (1 / years) - 1) * 100
+
+    if require_positive:
+        keep = (basket_past > 0) & (nifty_past > 0)
+        rows, basket_cagr, nifty_cagr = rows[keep], basket_cagr[keep], nifty_cagr[keep]
+
+    return (
+        format_month_labels(dates[rows], label_format) if label_rows is None else label_rows(rows),
+        np.round(basket_cagr, 2).tolist(),
+        np.round(nifty_cagr, 2).tolist(),
+    )
+
+
+# periodReturns keys and their length in calendar months
+PERIOD_MONTHS = (('1M', 1), ('3M', 3), ('6M', 6), ('1Y', 12), ('3Y', 36), ('5Y', 60))
+
+
+def trailing_cagr(values, lookback_index, row, years, default=0):
+    """CAGR over the `years` calendar years ending at `row`, rounded to 2dp.
+
+    Returns `default` when the history is too short or either NAV is missing.
+    """
+    past = lookback_index.lookback(row, years * 12)
+    if past is None:
+        return default
+    latest, base = float(values[row]), float(values[past])
+    if not base > 0 or np.isnan(latest):
+        return default
+    return round(((latest / base) ** (1 / years) - 1) * 100, 2)
+
+
+def trailing_returns(values, lookback_index, row):
+    """1M..5Y returns ending at `row`; multi-year periods are divided by their years.
+
+    Periods without enough history (or with a missing NAV) are left out.
+    """
+    returns = {}
+    for key, months in PERIOD_MONTHS:
+        past = lookback_index.lookback(row, months)
+        if past is None:
+            continue
+        latest, base = float(values[row]), float(values[past])
+        if not base > 0 or np.isnan(latest):
+            continue
+        change = (latest - base) / base * 100
+        if months > 12:
+            change /= months // 12
+        returns[key] = round(change, 2)
+    return returns
+
+
+# Rolling windows summarised by rolling_distributions, in years
+ROLLING_WINDOWS = (1, 3, 5, 7, 10)
+
+# Percentiles reported for every rolling-CAGR distribution
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+
+def cagr_distribution(cagr, dates, rows, past):
+    """Summary of rolling CAGRs (%) whose windows run from dates[past] to dates[rows]"""
+    worst, best = int(np.argmin(cagr)), int(np.argmax(cagr))
+    return {
+        'min': round(float(cagr[worst]), 2),
+        'max': round(float(cagr[best]), 2),
+        'mean': round(float(cagr.mean()), 2),
+        'median': round(float(np.median(cagr)), 2),
+        'percentiles': {f'p{p}': round(float(v), 2) for p, v in zip(PERCENTILES, np.percentile(cagr, PERCENTILES))},
+        'positivePct': round(float((cagr > 0).mean()) * 100, 2),
+        'worstWindow': {'start': str(dates[past[worst]]), 'end': str(dates[rows[worst]])},
+        'bestWindow': {'start': str(dates[past[best]]), 'end': str(dates[rows[best]])},
+    }
+
+
+def rolling_distributions(dates, basket, nifty, lookback_index):
+    """Distribution of every rolling 1/3/5/7/10Y CAGR of the basket and NIFTY.
+
+    Each window ends on a row with a full calendar-year lookback, so the
+    CAGR arrays come from one gather per window length. Returns
+    {'3Y': {'windows', 'firstEnd', 'lastEnd', 'basket', 'nifty',
+    'beatNiftyPct', 'excess'}, ...}, with None where the history is too short.
+    """
+    dates = np.asarray(dates).astype('datetime64[D]')
+    basket = np.asarray(basket, dtype=np.float64)
+    nifty = np.asarray(nifty, dtype=np.float64)
+    distributions = {}
+    for years in ROLLING_WINDOWS:
+        lookback = lookback_index.positions(years * 12)
+        rows = np.flatnonzero(lookback >= 0)
+        if len(rows) == 0:
+            distributions[f'{years}Y'] = None
+            continue
+        past = lookback[rows]
+        basket_cagr = ((basket[rows] / basket[past]) ** (1 / years) - 1) * 100
+        nifty_cagr = ((nifty[rows] / nifty[past]) ** (1 / years) - 1) * 100
+        excess = basket_cagr - nifty_cagr
+        distributions[f'{years}Y'] = {
+            'windows': len(rows),
+            'firstEnd': str(dates[rows[0]]),
+            'lastEnd': str(dates[rows[-1]]),
+            'basket': cagr_distribution(basket_cagr, dates, rows, past),
+            'nifty': cagr_distribution(nifty_cagr, dates, rows, past),
+            'beatNiftyPct': round(float((excess > 0).mean()) * 100, 2),
+            'excess': {
+                'mean': round(float(excess.mean()), 2),
+                'median': round(float(np.median(excess)), 2),
+                'min': round(float(excess.min()), 2),
+                'max': round(float(excess.max()), 2),
+            },
+        }
+    return distributions
@@ -0,0 +1,100 @@
+"""Rolling volatility, Sharpe ratio, beta and correlation to NIFTY from prefix sums.
+
+For the daily returns r of the basket and n of NIFTY, the cumulative sums of
+r, n, r*r, n*n and r*n are computed once per series. The sums over any
+window are then the difference of two prefix entries, so every statistic of
+every window ending on every row costs O(1) and a whole chart series is a
+handful of vectorised subtractions:
+
+    mean = S(r) / k        variance = (S(r*r) - S(r)^2 / k) / (k - 1)
+    beta = cov(r, n) / variance(n)    correlation = cov(r, n) / (sd(r) sd(n))
+
+for the k returns in a window. Returns are centred on their overall mean
+before summing, which leaves variances and covariances unchanged but keeps
+the subtraction from losing precision. Windows are whole calendar months
+(rows come from the LookbackIndex) and are annualised with the rows the
+window actually has per year, like risk_metrics.py.
+"""
+import numpy as np
+
+from risk_metrics import MIN_RETURNS, RISK_FREE_RATE
+
+# Window lengths a rolling risk chart can use, in calendar months
+WINDOWS = {'3M': 3, '6M': 6, '1Y': 12, '3Y': 36}
+DEFAULT_WINDOW = '1Y'
+
+
+def return_sums(basket, nifty):
+    """Prefix sums of the centred daily returns, their squares and cross product.
+
+    Entry i of each array sums the returns of rows 1..i, so a window from
+    row `past` to row `row` sums to sums[row] - sums[past].
+    """
+    basket = np.asarray(basket, dtype=np.float64)
+    nifty = np.asarray(nifty, dtype=np.float64)
+    basket_returns = basket[1:] / basket[:-1] - 1
+    nifty_returns = nifty[1:] / nifty[:-1] - 1
+    basket_mean = basket_returns.mean() if len(basket_returns) else 0.0
+    nifty_mean = nifty_returns.mean() if len(nifty_returns) else 0.0
+    b = basket_returns - basket_mean
+    n = nifty_returns - nifty_mean
+
+    def prefix(values):
+        return np.r_[0.0, np.cumsum(values)]
+
+    return {
+        'basket_mean': basket_mean,
+        'nifty_mean': nifty_mean,
+        'basket': prefix(b),
+        'nifty': prefix(n),
+        'basket_sq': prefix(b * b),
+        'nifty_sq': prefix(n * n),
+        'cross': prefix(b * n),
+    }
+
+
+def rolling_risk(dates, sums, rows, past, risk_free=RISK_FREE_RATE):
+    """Rolling statistics of the windows dates[past]..dates[rows] (arrays of row positions).
+
+    Returns {'rows', 'basketVolatility', 'niftyVolatility', 'basketSharpe',
+    'niftySharpe', 'beta', 'correlation'} arrays, keeping only the windows
+    with more than MIN_RETURNS returns; volatility is in %, the rest are
+    ratios, NaN where a window's returns do not vary.
+    """
+    rows = np.asarray(rows, dtype=np.intp)
+    past = np.asarray(past, dtype=np.intp)
+    keep = (past >= 0) & (rows - past > MIN_RETURNS)
+    rows, past = rows[keep], past[keep]
+    count = (rows - past).astype(np.float64)
+    years = (dates[rows] - dates[past]) / np.timedelta64(1, 'D') / 365.25
+    per_year = count / years
+
+    def window_sum(key):
+        return sums[key][rows] - sums[key][past]
+
+    basket_sum, nifty_sum = window_sum('basket'), window_sum('nifty')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        basket_var = np.maximum(window_sum('basket_sq') - basket_sum ** 2 / count, 0) / (count - 1)
+        nifty_var = np.maximum(window_sum('nifty_sq') - nifty_sum ** 2 / count, 0) / (count - 1)
+        covariance = (window_sum('cross') - basket_sum * nifty_sum / count) / (count - 1)
+        daily_free = (1 + risk_free / 100) ** (1 / per_year) - 1
+
+        def sharpe(total, mean, variance):
+            excess = (total / count + mean - daily_free) * per_year
+            return np.where(variance > 0, excess / np.sqrt(variance * per_year), np.nan)
+
+        return {
+            'rows': rows,
+            'basketVolatility': np.sqrt(basket_var * per_year) * 100,
+            'niftyVolatility': np.sqrt(nifty_var * per_year) * 100,
+            'basketSharpe': sharpe(basket_sum, sums['basket_mean'], basket_var),
+            'niftySharpe': sharpe(nifty_sum, sums['nifty_mean'], nifty_var),
+            'beta': np.where(nifty_var > 0, covariance / nifty_var, np.nan),
+            'correlation': np.where((basket_var > 0) & (nifty_var > 0),
+                                    covariance / np.sqrt(basket_var * nifty_var), np.nan),
+        }
+
+
+def rounded(values, digits=2):
+    """Rounded floats for JSON, None for NaN"""
+    return [None if v != v else v for v in np.round(values, digits).tolist()]
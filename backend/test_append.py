@@ -0,0 +1,44 @@
+"""Two workers appending to one series through a shared NAV store.
+
+Run from backend/: python test_append.py. It uses a throwaway store, so
+the real nav_store.sqlite3 is left alone.
+"""
+import os
+import tempfile
+
+import numpy as np
+
+scratch = tempfile.mkdtemp()
+os.environ['ALPHANIFTY_NAV_DB'] = os.path.join(scratch, 'navs.sqlite3')
+os.environ['ALPHANIFTY_QUALITY_REPORT'] = os.path.join(scratch, 'quality.json')
+os.environ['ALPHANIFTY_RELOAD_INTERVAL'] = '0'
+
+import app
+import nav_store
+
+
+def rows(dates, basket, nifty):
+    return {'dates': np.array(dates, dtype='datetime64[D]'), 'basket': np.array(basket), 'nifty': np.array(nifty)}
+
+
+series = app.served_series['great_india']
+last = series.index.last
+first, second = str(last + np.timedelta64(1, 'D')), str(last + np.timedelta64(2, 'D'))
+basket, nifty = float(series.basket[series.index.valid - 1]), float(series.nifty[series.index.valid - 1])
+
+# "Another worker" appends first; this worker has not polled since
+with nav_store.connect() as conn:
+    nav_store.append_series(conn, 'great_india', rows([first], [basket], [nifty]))
+result = app.append_navs('great_india', rows([second], [basket * 1.01], [nifty * 1.01]))
+
+served = app.served_series['great_india']
+assert [str(d) for d in served.dates[-2:]] == [first, second], served.dates[-3:]
+assert app.reload_data()['changed'] == []
+
+# A worker that only reads the store serves the same rows under the same version
+app.served_series = {**app.served_series, 'great_india': series}
+app.appended_digests = {}
+reloaded = app.reload_data()
+assert reloaded['version'] == result['version'], (reloaded['version'], result['version'])
+assert (app.served_series['great_india'].dates == served.dates).all()
+print(f"✓ {first} and {second} served by both workers as version {result['version']}")
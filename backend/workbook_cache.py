@@ -0,0 +1,198 @@
+"""Binary on-disk cache for the basket Excel workbooks.
+
+Parsing the .xlsx files through openpyxl costs several seconds on every
+start, so each workbook is converted once into an uncompressed .npz file
+(one NumPy array per column) and loaded from there afterwards.  A cache
+entry records the source file's mtime, size and SHA-256; it is reused while
+those match and rebuilt automatically when the workbook changes.
+
+Pre-build every cache at deploy time with:
+
+    python workbook_cache.py build
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get('ALPHANIFTY_CACHE_DIR', os.path.join(BACKEND_DIR, '.cache', 'workbooks'))
+
+# Bump when the on-disk layout changes so old caches are rebuilt
+CACHE_FORMAT = 1
+
+# Workbooks read by app.py at startup
+BASKET_WORKBOOKS = [
+    'White Basket.xlsx',
+    'every_common_india.xlsx',
+    'Raising_India.xlsx',
+    'Greate India Basket.xlsx',
+    'aggresive basket.xlsx',
+    'CONSERVATIVE BASKET.xlsx',
+    'Dusshera basket.xlsx',
+    'Yellow basket.xlsx',
+]
+
+
+def file_sha256(path):
+    """Return the hex SHA-256 digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path_for(path):
+    """Location of the cache file for a workbook"""
+    return os.path.join(CACHE_DIR, os.path.basename(path) + '.npz')
+
+
+def _read_meta(cache_path):
+    with np.load(cache_path, allow_pickle=False) as data:
+        return json.loads(str(data['__meta__']))
+
+
+def _write_cache(cache_path, df, meta):
+    """Write the DataFrame columns and metadata atomically"""
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    arrays = {'__meta__': np.array(json.dumps(meta))}
+    for i, column in enumerate(df.columns):
+        values = df[column].to_numpy()
+        if values.dtype == object:
+            values = values.astype(str)
+        arrays[f'c{i}'] = values
+
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, cache_path)
+
+
+def _load_cache(cache_path, meta):
+    import pandas as pd
+
+    with np.load(cache_path, allow_pickle=False) as data:
+        columns = {name: data[f'c{i}'] for i, name in enumerate(meta['columns'])}
+    return pd.DataFrame(columns)
+
+
+def cache_status(path):
+    """Return 'fresh', 'touched' (same content, new mtime), 'stale' or 'missing'"""
+    cache_path = cache_path_for(path)
+    if not os.path.exists(cache_path):
+        return 'missing'
+    try:
+        meta = _read_meta(cache_path)
+    except (OSError, ValueError, KeyError):
+        return 'stale'
+    if meta.get('format') != CACHE_FORMAT:
+        return 'stale'
+
+    stat = os.stat(path)
+    if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+        return 'fresh'
+    if meta['size'] == stat.st_size and meta['sha256'] == file_sha256(path):
+        return 'touched'
+    return 'stale'
+
+
+def build_cache(path):
+    """Parse a workbook with pandas and (re)write its cache. Returns the DataFrame."""
+    # Imported here so serving from the caches never loads pandas/openpyxl
+    import pandas as pd
+
+    stat = os.stat(path)
+    df = pd.read_excel(path)
+    meta = {
+        'format': CACHE_FORMAT,
+        'source': os.path.basename(path),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': file_sha256(path),
+        'columns': [str(c) for c in df.columns],
+    }
+    try:
+        _write_cache(cache_path_for(path), df, meta)
+    except OSError as e:
+        logger.warning('Could not write workbook cache for %s: %s', path, e)
+    return df
+
+
+def read_workbook(path):
+    """Drop-in replacement for pd.read_excel(path) backed by the binary cache"""
+    status = cache_status(path)
+    if status == 'missing' or status == 'stale':
+        return build_cache(path)
+
+    cache_path = cache_path_for(path)
+    meta = _read_meta(cache_path)
+    df = _load_cache(cache_path, meta)
+    if status == 'touched':
+        # Content is unchanged, only refresh the recorded mtime so the next
+        # start can skip hashing again
+        stat = os.stat(path)
+        meta['mtime_ns'] = stat.st_mtime_ns
+        try:
+            _write_cache(cache_path, df, meta)
+        except OSError as e:
+            logger.warning('Could not refresh workbook cache for %s: %s', path, e)
+    return df
+
+
+def workbook_fingerprint(path):
+    """SHA-256 of a source file, taken from its cache metadata when fresh"""
+    if path.endswith('.xlsx') and cache_status(path) == 'fresh':
+        return _read_meta(cache_path_for(path))['sha256']
+    return file_sha256(path)
+
+
+def data_version(paths):
+    """Short identifier that changes whenever any of the source files changes"""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(os.path.basename(path).encode())
+        digest.update(workbook_fingerprint(path).encode())
+    return digest.hexdigest()[:16]
+
+
+def _resolve(files):
+    return [f if os.path.isabs(f) else os.path.join(BACKEND_DIR, f) for f in (files or BASKET_WORKBOOKS)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Manage the binary cache of basket workbooks')
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='Build caches that are missing or out of date')
+    build.add_argument('--force', action='store_true', help='Rebuild every cache even if fresh')
+    build.add_argument('files', nargs='*', help='Workbooks to process (default: all basket workbooks)')
+    status = sub.add_parser('status', help='Show the cache state of each workbook')
+    status.add_argument('files', nargs='*')
+    args = parser.parse_args(argv)
+
+    for path in _resolve(args.files):
+        if not os.path.exists(path):
+            print(f'✗ {os.path.basename(path)}: workbook not found')
+            continue
+        state = cache_status(path)
+        if args.command == 'status':
+            print(f'{os.path.basename(path)}: {state}')
+        elif state == 'touched' and not args.force:
+            read_workbook(path)
+            print(f'✓ {os.path.basename(path)}: refreshed')
+        elif args.force or state != 'fresh':
+            build_cache(path)
+            print(f'✓ {os.path.basename(path)}: built')
+        else:
+            print(f'✓ {os.path.basename(path)}: up to date')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -23,6 +23,12 @@ echo "Installing Python dependencies..."
 pip3 install -r backend/requirements.txt
 echo "✓ Python packages installed"
 
+# Convert basket workbooks into the binary cache so the service starts fast
+echo ""
+echo "Building workbook cache..."
+python3 backend/workbook_cache.py build
+echo "✓ Workbook cache ready"
+
 # Rebuild frontend
 echo ""
 echo "Building frontend..."
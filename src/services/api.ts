@@ -54,7 +54,36 @@ export interface BasketAPIResponse {
   rebalancingFrequency: string;
 }
 
+export interface BasketBatchItem {
+  slug: string;
+  years: number;
+  data: Partial<BasketAPIResponse>;
+}
+
 export const basketAPI = {
+  /**
+   * Fetch several baskets in one request.
+   * Each id may carry its own years as `slug:years`; `fields` limits the
+   * top-level keys returned (e.g. leave out graphData for list pages).
+   */
+  async getBaskets(ids: string[], years: number = 5, fields?: string[]): Promise<BasketBatchItem[]> {
+    try {
+      const params = new URLSearchParams({ ids: ids.join(','), years: String(years) });
+      if (fields && fields.length > 0) {
+        params.set('fields', fields.join(','));
+      }
+      const response = await fetch(`${API_BASE_URL}/baskets?${params.toString()}`);
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+      const result = await response.json();
+      return result.baskets;
+    } catch (error) {
+      console.error('Error fetching baskets:', error);
+      throw error;
+    }
+  },
+
   /**
    * Fetch Conservative Balanced Basket data from backend
    */